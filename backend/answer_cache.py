@@ -0,0 +1,125 @@
+"""Semantic Answer Cache for FlashPoint Queries
+
+Analysts ask the same few questions over and over ("what's happening in
+Gaza?"), and every one costs a multi-second CPU generation. This cache
+returns the previous answer when a new query is semantically close to a
+cached one AND retrieval produced the same documents. When new documents
+enter the query's neighborhood the retrieved set changes, the entry is
+invalidated and the answer is regenerated.
+
+Features:
+- Lookup by cosine similarity of query embeddings (configurable threshold)
+- Validity check on the exact set of retrieved document ids
+- TTL expiry and LRU eviction (bounded number of entries)
+- Hit / miss / invalidation counters
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+def document_ids(docs):
+    """Stable identity of a retrieved document set (order-insensitive)"""
+    ids = []
+    for doc in docs or []:
+        metadata = doc.get("metadata") or {}
+        ids.append(metadata.get("url") or doc.get("text", ""))
+    return frozenset(ids)
+
+
+class SemanticAnswerCache:
+    """Maps (query embedding, retrieved document set) to a generated answer
+
+    Attributes:
+        threshold (float): Minimum cosine similarity between query embeddings
+        ttl (float): Seconds an answer stays valid
+        max_entries (int): LRU capacity
+    """
+
+    def __init__(self, threshold=0.92, ttl=600, max_entries=256):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()  # entry id -> (unit vector, doc ids, answer, created)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._next_id = 0
+        self._matrix = None  # Stacked vectors of current entries (rebuilt lazily)
+        self._matrix_ids = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _unit(vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _remove(self, entry_id):
+        del self.entries[entry_id]
+        self._matrix = None
+
+    def _nearest(self, unit):
+        """Best entry by cosine similarity above the threshold, or None"""
+        if not self.entries:
+            return None
+        if self._matrix is None:
+            self._matrix_ids = list(self.entries)
+            self._matrix = np.stack([self.entries[i][0] for i in self._matrix_ids])
+        scores = self._matrix @ unit
+        best = int(np.argmax(scores))
+        return self._matrix_ids[best] if scores[best] >= self.threshold else None
+
+    def lookup(self, query_vector, doc_ids):
+        """Return the cached answer for a similar query over the same documents
+
+        Args:
+            query_vector: Query embedding
+            doc_ids (frozenset): Ids of the documents retrieved for this query
+
+        Returns:
+            str or None: Cached answer on hit
+        """
+        unit = self._unit(query_vector)
+        now = time.time()
+        with self._lock:
+            # Drop expired entries (oldest-used first)
+            for entry_id in [i for i, e in self.entries.items() if now - e[3] > self.ttl]:
+                self._remove(entry_id)
+
+            entry_id = self._nearest(unit)
+            if entry_id is None:
+                self.misses += 1
+                return None
+
+            _, cached_ids, answer, _ = self.entries[entry_id]
+            if cached_ids != doc_ids:
+                # New documents entered the neighborhood: answer is stale
+                self._remove(entry_id)
+                self.invalidations += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(entry_id)
+            self.hits += 1
+            return answer
+
+    def store(self, query_vector, doc_ids, answer):
+        """Remember an answer, evicting the least recently used entry if full"""
+        with self._lock:
+            self.entries[self._next_id] = (self._unit(query_vector), doc_ids, answer, time.time())
+            self._next_id += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._matrix = None
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": len(self.entries),
+        }
@@ -2,76 +2,96 @@
 
 Responsibilities:
 - Receives real-time event stream from Pathway (news, Reddit, Telegram, RSS)
-- Serves events to frontend dashboard via polling
-- Generates intelligence reports using Google Gemini API
+- Serves events to frontend dashboard via cursor-based incremental polling
+- Pushes events to live dashboards over Server-Sent Events
+- Generates intelligence reports from an incrementally maintained SITREP (Gemini)
 - Extracts geolocation data from events for mapping visualization
+- Exposes Prometheus metrics (ingest lag, feed buffer occupancy) at /metrics
+- Snapshots the feed buffer to disk and restores it on restart
+- Serves immediately: the Gemini client loads in the background (/healthz, /readyz)
 """
 
-from fastapi import FastAPI, Request
+import time
+
+STARTED = time.perf_counter()  # Before heavy imports: startup breakdown baseline
+
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 
 import uvicorn
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from collections import deque
-import google.generativeai as genai
 from dotenv import load_dotenv
 import os
+import json
+import uuid
+from feed_bus import FeedBroadcaster, RESYNC, format_sse
+from gazetteer import load_gazetteer
+from sitrep import GeminiBackend, SitrepEngine, make_backend
+from report_jobs import ReportJobs
+from metrics import FEED_BUFFER_EVENTS, metrics_response, observe_lag
+from feed_snapshot import FeedSnapshot, SNAPSHOT_INTERVAL
+from startup import Startup
+import asyncio
+import threading
 
 # Load environment variables from .env file
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-# ========== GEOLOCATION REFERENCE DATA ==========
-# Mapping of place names to geographic coordinates
-# Used to extract lat/lon from event text for map visualization
-GEO_LOCATIONS = {
-    "Kyiv": {"lat": 50.4501, "lon": 30.5234},
-    "Ukraine": {"lat": 48.3794, "lon": 31.1656},
-    "Moscow": {"lat": 55.7558, "lon": 37.6173},
-    "Russia": {"lat": 61.5240, "lon": 105.3188},
-    "Washington": {"lat": 38.9072, "lon": -77.0369},
-    "USA": {"lat": 37.0902, "lon": -95.7129},
-    "Beijing": {"lat": 39.9042, "lon": 116.4074},
-    "China": {"lat": 35.8617, "lon": 104.1954},
-    "Gaza": {"lat": 31.5, "lon": 34.466},
-    "Israel": {"lat": 31.0461, "lon": 34.8516},
-    "Taiwan": {"lat": 23.6978, "lon": 120.9605},
-    "London": {"lat": 51.5074, "lon": -0.1278},
-    "Tehran": {"lat": 35.6892, "lon": 51.3890},
-    "Iran": {"lat": 32.4279, "lon": 53.6880},
-    "Delhi": {"lat": 28.6139, "lon": 77.2090},
-    "India": {"lat": 20.5937, "lon": 78.9629},
-}
+# Startup breakdown; the API is ready once it serves the feed
+startup = Startup(STARTED)
+startup.record("imports", time.perf_counter() - STARTED)
+startup.require("feed")
 
+# ========== GEOLOCATION REFERENCE DATA ==========
+# Memory-mapped gazetteer (place names, aliases, coordinates, population)
+# Built offline with tools/build_gazetteer.py; falls back to built-in seed places
+GAZETTEER_PATH = os.getenv("FLASHPOINT_GAZETTEER", os.path.join("..", "data", "gazetteer.bin"))
+with startup.phase("gazetteer"):
+    gazetteer = load_gazetteer(GAZETTEER_PATH)
 
 
 def extract_location(text):
-    """Extract geolocation coordinates from event text via keyword matching
+    """Extract geolocation coordinates from event text
     
-    Strategy: Simple string matching against known place names
-    - Case-insensitive matching
-    - Returns first match found
-    - Suitable for rapid preprocessing in high-throughput scenarios
+    Strategy: one-pass Aho-Corasick match against the gazetteer
+    - Case-insensitive, word-boundary aware, capitalized mentions only
+    - Ambiguous names resolve to the most specific, then most populous place
+    - Sub-millisecond per event independent of gazetteer size
     
     Args:
         text (str): Event text (title + description)
     
     Returns:
-        dict or None: {"lat": float, "lon": float} if location found, else None
+        dict or None: {"lat": float, "lon": float, "place": str} if location found, else None
     """
-    if not text:
-        return None
-    
-    # Perform keyword matching against geolocation reference data
-    for place, coords in GEO_LOCATIONS.items():
-        if place in text or place.lower() in text.lower():
-            return coords
-    return None
+    return gazetteer.locate(text)
 
 
 # ========== GEMINI AI SETUP ==========
-# Configure Google Generative AI for intelligence report generation
-genai.configure(api_key=GEMINI_API_KEY)
-gemini_model = genai.GenerativeModel('gemini-flash-latest')
+# Google Generative AI for intelligence report generation, configured on first use
+def load_gemini_model():
+    import google.generativeai as genai
+
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai.GenerativeModel('gemini-flash-latest')
+
+
+# Rolling SITREP: per-region/window partial summaries refreshed in the background
+# (started with the app, capped per tick, only while reports are requested),
+# so a report request is a single merge call (FLASHPOINT_SITREP_BACKEND=stub for offline)
+sitrep = SitrepEngine(
+    make_backend(load_gemini_model if GEMINI_API_KEY else None),
+    max_refresh=int(os.getenv("FLASHPOINT_SITREP_MAX_REFRESH", 4)),
+)
+
+# Report jobs: generation off the request path, one in-flight job per feed version
+report_jobs = ReportJobs(sitrep)
+# Seconds the legacy report endpoint waits for its job
+REPORT_TIMEOUT = 120
+# Longest long-poll accepted on job status
+MAX_REPORT_WAIT = 30
 
 # ========== FASTAPI APPLICATION SETUP ==========
 app = FastAPI()
@@ -80,92 +100,350 @@ app = FastAPI()
 # Stores recent events from Pathway (FIFO, max 100 items)
 # Enables frontend polling to retrieve latest updates
 latest_news = deque(maxlen=100)
+# URL -> buffered event, to attach near-duplicates to their original
+buffered_by_url = {}
+FEED_BUFFER_EVENTS.set_function(lambda: len(latest_news))
+
+# Monotonically increasing sequence number of the last feed change (a new
+# event, or a near-duplicate attached to a buffered one). Every buffered event
+# carries its own "seq" and the "updated_seq" of its last change; clients use
+# the highest one they have seen as a cursor.
+last_seq = 0
+
+# ========== WARM RESTART ==========
+# Buffer and cursor survive restarts (FLASHPOINT_FEED_SNAPSHOT, empty disables)
+feed_snapshot = FeedSnapshot(os.getenv("FLASHPOINT_FEED_SNAPSHOT", os.path.join("..", "data", "feed_snapshot.json")))
+with startup.phase("feed restore"):
+    restored_events, last_seq, restored_epoch = feed_snapshot.load()
+    # Distinguishes sequence numbers across restarts: kept when the snapshot
+    # continues them exactly (clean shutdown), otherwise clients start over
+    FEED_EPOCH = restored_epoch or uuid.uuid4().hex[:8]
+    for restored in restored_events:
+        latest_news.append(restored)
+        buffered_by_url[restored.get("url")] = restored
+        sitrep.add(restored)
+
+
+# Push channel: fans out each accepted event to SSE subscribers
+broadcaster = FeedBroadcaster()
+
+# Seconds between SSE keep-alive comments on an idle stream
+SSE_KEEPALIVE_SECONDS = 15
+
+
+@app.on_event("startup")
+async def start_feed_snapshots():
+    """Snapshot the feed buffer every SNAPSHOT_INTERVAL seconds (on the event loop)"""
+    async def snapshot_loop():
+        while True:
+            await asyncio.sleep(SNAPSHOT_INTERVAL)
+            try:
+                feed_snapshot.save(list(latest_news), last_seq, FEED_EPOCH)
+            except OSError as e:
+                print(f"⚠️ [Snapshot] Feed snapshot failed: {e}")
+
+    asyncio.create_task(snapshot_loop())
+
+
+@app.on_event("startup")
+def warm_up():
+    """Serving now: mark the feed ready, start the SITREP refresher and load the Gemini client off the request path"""
+    startup.set_ready("feed")
+    sitrep.start()
+    if isinstance(sitrep.backend, GeminiBackend):
+        def load():
+            with startup.phase("gemini load"):
+                sitrep.backend.model
+
+        threading.Thread(target=load, name="flashpoint-gemini-warmup", daemon=True).start()
+
+
+@app.on_event("shutdown")
+def save_feed_snapshot():
+    feed_snapshot.save(list(latest_news), last_seq, FEED_EPOCH, final=True)
+
+
+def feed_etag(seq):
+    """Build the feed ETag for a buffer whose last change has sequence ``seq``"""
+    return f'"{FEED_EPOCH}-{seq}"'
+
+
+def updated_seq(event):
+    """Sequence number of the event's last change (restored events may predate the field)"""
+    return event.get("updated_seq", event["seq"])
 
 @app.get("/")
 def read_root():
     """Health check endpoint - confirms API is running"""
     return {"status": "Flashpoint Receiver Online"}
 
-# ========== EVENT INGESTION ENDPOINT ==========
-@app.post("/v1/stream")
-async def receive_stream(data: Dict[str, Any]):
-    """Receive structured events from Pathway data pipeline
+
+@app.get("/healthz")
+def healthz():
+    """Liveness: the process is up and serving"""
+    return {"status": "alive"}
+
+
+@app.get("/readyz")
+def readyz(response: Response):
+    """Readiness: 200 once the feed is served, else 503 (with startup breakdown)"""
+    status = startup.status()
+    if not status["ready"]:
+        response.status_code = 503
+    return status
+
+# ========== EVENT INGESTION ==========
+def ingest_event(data):
+    """Accept one event into the feed
     
     Flow:
-    1. Extract geolocation from event text if present
-    2. Augment event with lat/lon coordinates
-    3. Store in memory buffer for frontend polling
+    1. Collapse near-duplicates into their buffered original (bumping its
+       "updated_seq" so cursor-based clients refetch it)
+    2. Extract geolocation from event text if present
+    3. Augment event with lat/lon coordinates
+    4. Stamp event with the next sequence number
+    5. Store in memory buffer for frontend polling
+    6. Push to live SSE subscribers
+    7. Route to its SITREP partition
     
-    Args:
-        data: Event dict with keys [source, text, url, timestamp, bias]
+    Must run on the event loop thread (no lock around the sequence counter).
     
-    Returns:
-        dict: Acknowledgment with event count in buffer
+    Args:
+        data: Event dict with keys [source, text, url, timestamp, bias, duplicate_of]
     """
+    observe_lag("feed", data.get("timestamp"), time.time())
+
+    # Near-duplicate of a buffered event: record it on the original instead of
+    # taking a buffer slot (copies of evicted originals are kept as new events)
+    duplicate_of = data.get("duplicate_of")
+    original = buffered_by_url.get(duplicate_of) if duplicate_of else None
+    global last_seq
+    if original is not None:
+        copy = {"source": data.get("source"), "url": data.get("url"), "bias": data.get("bias")}
+        original.setdefault("duplicates", []).append(copy)
+        last_seq += 1
+        original["updated_seq"] = last_seq
+        broadcaster.publish({"duplicate_of_seq": original["seq"], "seq": last_seq, **copy})
+        return
+
     # Attempt geolocation extraction for map visualization
     coords = extract_location(data['text'])
     if coords:
         # Augment event with geographic coordinates
         data["lat"] = coords["lat"]
         data["lon"] = coords["lon"]
+        data["place"] = coords["place"]
             
+    # Assign feed cursor position
+    last_seq += 1
+    data["seq"] = data["updated_seq"] = last_seq
+
     # Append to circular buffer (auto-evicts oldest if full)
+    if len(latest_news) == latest_news.maxlen:
+        evicted = latest_news[0]
+        if buffered_by_url.get(evicted.get("url")) is evicted:
+            del buffered_by_url[evicted["url"]]
     latest_news.append(data)
-       
+    buffered_by_url[data.get("url")] = data
+    broadcaster.publish(data)
+    sitrep.add(data)
+
+
+@app.post("/v1/stream")
+async def receive_stream(data: Dict[str, Any]):
+    """Receive a single structured event from Pathway data pipeline
+    
+    Args:
+        data: Event dict with keys [source, text, url, timestamp, bias]
+    
+    Returns:
+        dict: Acknowledgment with event count in buffer
+    """
+    ingest_event(data)
     return {"status": "received", "count": len(data)}
 
+
+@app.post("/v1/stream/batch")
+async def receive_stream_batch(request: Request):
+    """Receive many events in one request from the batching Pathway writer
+    
+    Accepts either a JSON array of events or NDJSON (one event per line,
+    Content-Type: application/x-ndjson). Events are ingested in body order.
+    
+    Returns:
+        dict: Acknowledgment with the number of events accepted
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+
+    try:
+        if "ndjson" in content_type:
+            events = [json.loads(line) for line in body.splitlines() if line.strip()]
+        else:
+            events = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Malformed batch: {e}")
+
+    if not isinstance(events, list) or not all(isinstance(e, dict) and "text" in e for e in events):
+        raise HTTPException(status_code=400, detail="Batch must be a list of event objects")
+
+    for event in events:
+        ingest_event(event)
+    return {"status": "received", "count": len(events)}
+
 # ========== EVENT POLLING ENDPOINT ==========
 @app.get("/v1/frontend/feed")
-def get_feed():
-    """Provide event stream to frontend dashboard via polling
+def get_feed(request: Request, response: Response, after: Optional[int] = None):
+    """Provide event stream to frontend dashboard via incremental polling
+    
+    Clients pass the highest sequence number they have already seen as
+    ``after`` and receive the events changed since: new events, and buffered
+    ones that gained a near-duplicate ("updated_seq" > ``after``). The ETag
+    identifies the last change, so a client that sends it back via
+    If-None-Match gets an empty 304 when nothing has changed.
+    
+    X-Feed-Epoch changes whenever the backend restarts: clients seeing a new
+    epoch must drop their cursor and refetch, since sequence numbers of the
+    old process mean nothing in the new one. A cursor ahead of the server is
+    treated as a fresh client and receives the whole buffer.
+    
+    Args:
+        after: Sequence number of the last change the client already has
+    
+    Returns:
+        list: Array of event dicts changed after ``after`` (in seq order)
+    """
+    seq = last_seq
+    etag = feed_etag(seq)
+    headers = {"ETag": etag, "X-Feed-Cursor": str(seq), "X-Feed-Epoch": FEED_EPOCH}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+
+    snapshot = list(latest_news)
+    if after is None or after > seq:
+        return snapshot
+
+    # Updated originals can sit anywhere in the buffer: filter all of it (100 items)
+    return [event for event in snapshot if updated_seq(event) > after]
+
+# ========== EVENT PUSH ENDPOINT ==========
+@app.get("/v1/frontend/stream")
+async def stream_feed(request: Request):
+    """Push new events to the dashboard as Server-Sent Events
     
-    Frontend periodically calls this to fetch new events
-    Returns entire buffer contents (frontend handles display logic)
+    Each message id is the sequence number of the change it carries.
+    Reconnecting clients send it back in Last-Event-ID and get the buffered
+    events changed since replayed first (in change order).
+    A client that falls more than one queue behind receives a "resync" event
+    carrying the current cursor and should catch up via /v1/frontend/feed.
+    "duplicate" events report a near-duplicate copy of the event with
+    seq ``duplicate_of_seq`` (the copy is listed in that event's "duplicates")
+    under the new sequence number ``seq``.
+    The X-Feed-Epoch response header identifies the backend process, as for
+    /v1/frontend/feed.
     
     Returns:
-        list: Array of event dicts sorted by ingestion order (oldest first)
+        StreamingResponse: text/event-stream of "event" / "resync" messages
     """
-    return list(latest_news)
+    last_event_id = request.headers.get("last-event-id")
+    sub = broadcaster.subscribe()
+
+    async def event_stream():
+        try:
+            # Replay anything missed since the client's last event
+            if last_event_id and last_event_id.isdigit():
+                cursor = int(last_event_id)
+                if cursor > last_seq:
+                    # Backend restarted since: the client's cursor is meaningless
+                    yield format_sse({"cursor": last_seq}, event="resync")
+                else:
+                    changed = [item for item in list(latest_news) if updated_seq(item) > cursor]
+                    for item in sorted(changed, key=updated_seq):
+                        yield format_sse(item, event="event", event_id=updated_seq(item))
+
+            while not await request.is_disconnected():
+                item = await sub.get(timeout=SSE_KEEPALIVE_SECONDS)
+                if item is None:
+                    yield ": keep-alive\n\n"
+                elif item is RESYNC:
+                    yield format_sse({"cursor": last_seq}, event="resync")
+                elif "duplicate_of_seq" in item:
+                    yield format_sse(item, event="duplicate", event_id=item["seq"])
+                else:
+                    yield format_sse(item, event="event", event_id=item["seq"])
+        finally:
+            broadcaster.unsubscribe(sub)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Feed-Epoch": FEED_EPOCH},
+    )
 
 # ========== INTELLIGENCE REPORT GENERATION ==========
+@app.post("/v1/reports", status_code=202)
+async def submit_report(response: Response):
+    """Start (or join) generation of a report for the current feed
+
+    Concurrent submits while the feed is unchanged share one job; a finished
+    job is returned as-is until new events arrive.
+
+    Returns:
+        dict: Job status {"job_id", "status", "version", "report", ...}
+    """
+    job = report_jobs.submit()
+    if job.status == "done":
+        response.status_code = 200
+    return job.to_dict()
+
+
+@app.get("/v1/reports/{job_id}")
+async def get_report(job_id: str, wait: float = 0):
+    """Report job status; ``wait`` long-polls up to that many seconds for completion
+
+    Returns:
+        dict: Job status, with "report" once status is "done"
+    """
+    job = report_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown report job")
+    if wait > 0:
+        await report_jobs.wait(job, min(wait, MAX_REPORT_WAIT))
+    return job.to_dict()
+
+
 @app.get("/v1/generate_report")
-def generate_report():
-    """Generates a formal intelligence briefing on a topic.
+async def generate_report():
+    """Generates a formal intelligence briefing from the rolling SITREP.
+
+    Partial summaries per region and time window are maintained as events
+    arrive; this merges them (one LLM call, cached until new events land).
+    Kept for existing clients: waits on a shared report job.
 
     Returns:
         dict: {"report": str} - Formatted SITREP from LLM
     """
+    job = report_jobs.submit()
+    if not await report_jobs.wait(job, REPORT_TIMEOUT):
+        raise HTTPException(status_code=504, detail=f"Report job {job.id} still running")
+    if job.status == "failed":
+        raise HTTPException(status_code=502, detail=job.error)
+    return {"report": job.report}
 
-    # 2. Prompt for Report Format
 
-    context_text = "\n".join([f"- {d['text']}-{d['source']}-{d['bias']}" for d in latest_news])
-    prompt = f""" TASK: Synthesize the provided 'Raw Intel' into a professional News Briefing. 
-        CONSTRAINTS:
-        1. Use ONLY the provided text below. Do NOT fill in missing data like names, dates, or events not present.
-        2. Tone: Objective, Journalistic, Concise.
-        3. Cite the source name in brackets [Source] for every claim.
-        4. Reply in plain text, do not give response in markdown
-    
-        RAW INTEL:
-        {context_text}
-    
-        REQUIRED OUTPUT FORMAT:
-        ##  Global Situation Summary
-        [Write a 2-3 sentence executive summary of the provided text]
+@app.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint (ingest lag, feed buffer occupancy)"""
+    body, content_type = metrics_response()
+    return Response(content=body, media_type=content_type)
 
-        ## Key Developments
-        - **[Category/Region]**: [Detail] [Source]
-        - **[Category/Region]**: [Detail] [Source]
-    
-        ## Outlook
-        [Short forecast based *only* on the provided trends]
-    """
-    
-    # Query Gemini to generate structured report
-    response = gemini_model.generate_content(prompt)
-    
-    # Return formatted response
-    return {"report": response.text}
+
+@app.get("/v1/sitrep/stats")
+def sitrep_stats():
+    """Partition, LLM call and report job counters of the SITREP engine"""
+    return {**sitrep.stats(), **report_jobs.stats()}
 
 
 
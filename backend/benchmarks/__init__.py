@@ -0,0 +1,13 @@
+"""Benchmarks Module: Performance Measurement Scripts
+
+Standalone scripts that measure FlashPoint components offline. Run them
+from the backend directory so the pipeline modules are importable, e.g.:
+
+    python -m benchmarks.ingest_throughput
+
+- ingest_throughput.py: per-row vs batched delivery from Pathway to the API receiver
+- geo_match.py: gazetteer place resolution latency at GeoNames scale
+- ann_recall.py: HNSW vs brute-force recall@5 and query latency
+- e2e.py: whole pipeline offline (ingest rate, event→searchable / feed latency, query latency, RSS)
+- embedder_compare.py: PyTorch vs ONNX Runtime fp32 / int8 embedding throughput and agreement
+"""
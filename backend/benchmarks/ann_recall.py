@@ -0,0 +1,140 @@
+"""ANN Index Benchmark: HNSW vs brute force recall@5 and query latency
+
+Measures the HNSW index used by the "hnsw" retriever (USearch, the same
+library Pathway's UsearchKnnFactory runs inside the engine) against exact
+brute-force search, at several corpus sizes. Metric, connectivity and
+expansion widths come from ``retrievers.hnsw_params()``, i.e. the shipped
+configuration including its FLASHPOINT_HNSW_* overrides; the command-line
+flags replace them to try other settings. The index is driven through the
+USearch Python package rather than a DocumentStore, so its version can
+differ from the one built into the engine.
+
+Vectors are 384-dim (all-MiniLM-L6-v2) unit vectors drawn from a Gaussian
+mixture, which clusters like topical news embeddings. Queries are perturbed
+corpus vectors. After the first pass 10% of the documents are deleted to
+check that removals never surface and recall holds.
+
+Requires: pip install usearch
+
+Usage (from backend/):
+    python -m benchmarks.ann_recall --sizes 10000 100000 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+from pathway.stdlib.indexing import USearchMetricKind
+from usearch.index import Index
+
+from retrievers import hnsw_params
+
+DIM = 384
+K = 5
+
+
+def usearch_metric(kind):
+    """USearch metric name of a Pathway USearchMetricKind (COS -> "cos")"""
+    for name in dir(USearchMetricKind):
+        if getattr(USearchMetricKind, name) is kind:
+            return name.lower()
+    raise ValueError(f"Unknown USearch metric {kind!r}")
+
+
+def index_config(args):
+    """Shipped HNSW settings, with command-line overrides"""
+    params = hnsw_params()
+    for field in ("connectivity", "expansion_add", "expansion_search"):
+        if getattr(args, field) is not None:
+            params[field] = getattr(args, field)
+    params["metric"] = usearch_metric(params["metric"])
+    return params
+
+
+def make_corpus(n, rng, n_clusters=256):
+    centers = rng.standard_normal((n_clusters, DIM)).astype(np.float32)
+    labels = rng.integers(0, n_clusters, n)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((n, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def exact_top_k(corpus, alive, queries):
+    """Exact top-K ids by cosine similarity over alive documents"""
+    scores = queries @ corpus.T
+    scores[:, ~alive] = -np.inf
+    top = np.argpartition(-scores, K, axis=1)[:, :K]
+    return [set(row) for row in top]
+
+
+def percentiles(latencies):
+    latencies = np.asarray(latencies) * 1000
+    return np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+
+def bench_size(n, n_queries, rng, config):
+    corpus = make_corpus(n, rng)
+    alive = np.ones(n, dtype=bool)
+    query_ids = rng.integers(0, n, n_queries)
+    queries = corpus[query_ids] + 0.05 * rng.standard_normal((n_queries, DIM)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    # 0 (engine: "let USearch choose") maps to the Python package's own defaults
+    index = Index(ndim=DIM, metric=config["metric"], connectivity=config["connectivity"] or None,
+                  expansion_add=config["expansion_add"] or None, expansion_search=config["expansion_search"] or None)
+    start = time.perf_counter()
+    index.add(np.arange(n), corpus)
+    build = time.perf_counter() - start
+
+    def run_pass(label):
+        truth = exact_top_k(corpus, alive, queries)
+        ann_lat, bf_lat, hits, leaked = [], [], 0, 0
+        for i, q in enumerate(queries):
+            t0 = time.perf_counter()
+            found = index.search(q, K).keys
+            ann_lat.append(time.perf_counter() - t0)
+            hits += len(truth[i] & set(found.tolist()))
+            leaked += int((~alive[found]).sum())
+
+            t0 = time.perf_counter()
+            scores = corpus @ q
+            scores[~alive] = -np.inf
+            np.argpartition(-scores, K)[:K]
+            bf_lat.append(time.perf_counter() - t0)
+
+        (a50, a99), (b50, b99) = percentiles(ann_lat), percentiles(bf_lat)
+        print(
+            f"{n:>9,} {label:<8} recall@{K} {hits / (K * len(queries)):.3f} | "
+            f"hnsw p50 {a50:7.3f} ms p99 {a99:7.3f} ms | "
+            f"brute p50 {b50:7.3f} ms p99 {b99:7.3f} ms"
+            + (f" | deleted returned: {leaked}" if label == "deleted" else "")
+        )
+
+    print(f"{n:>9,} build    {build:.1f}s ({n / build:,.0f} inserts/s)")
+    run_pass("full")
+
+    removed = rng.choice(n, n // 10, replace=False)
+    start = time.perf_counter()
+    index.remove(removed)
+    alive[removed] = False
+    print(f"{n:>9,} delete   {len(removed):,} docs in {time.perf_counter() - start:.2f}s")
+    run_pass("deleted")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--connectivity", type=int, help="Override the shipped setting (0 = usearch default)")
+    parser.add_argument("--expansion-add", type=int, help="Override the shipped setting (0 = usearch default)")
+    parser.add_argument("--expansion-search", type=int, help="Override the shipped setting (0 = usearch default)")
+    args = parser.parse_args()
+
+    config = index_config(args)
+    print(f"HNSW config: {config}")
+    rng = np.random.default_rng(7)
+    for n in args.sizes:
+        bench_size(n, args.queries, rng, config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""End-to-End Pipeline Benchmark: ingest, searchability, feed and query latency
+
+Runs the real ``main.run()`` pipeline offline:
+
+- Source: SimulationSource in load-generator mode (``--rate`` events/s)
+- Feed receiver: a local stub standing in for the API's /v1/stream/batch
+- LLM: a stub generator (fixed answer after ``--llm-delay`` ms), so query
+  latency measures retrieval, answer cache and queueing, not TinyLlama
+
+Reported metrics (also written as JSON to ``--output`` for comparing runs):
+
+- ingest_events_per_s: events delivered to the feed receiver per second
+- searchable_ms: event timestamp -> event returned by the retrieval route
+  (probes originals only: near-duplicates are never indexed)
+- feed_ms: event timestamp -> event received by the feed receiver
+- query_ms: POST /v1/query latency (p50/p95/p99)
+- peak_rss_mb: peak resident memory of the process (engine included)
+
+Usage (from backend/):
+    python -m benchmarks.e2e --rate 200 --duration 60 --output e2e.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import requests
+
+RECEIVER_PORT = 8766
+QUERY_PORT = 8013
+
+
+def percentiles(values):
+    """p50/p95/p99/mean/max of a list of milliseconds (None when empty)"""
+    if not values:
+        return None
+    data = np.asarray(values, dtype=np.float64)
+    return {
+        "count": len(values),
+        "p50": round(float(np.percentile(data, 50)), 2),
+        "p95": round(float(np.percentile(data, 95)), 2),
+        "p99": round(float(np.percentile(data, 99)), 2),
+        "mean": round(float(data.mean()), 2),
+        "max": round(float(data.max()), 2),
+    }
+
+
+# ========== STUB FEED RECEIVER ==========
+
+class FeedReceiver:
+    """Stand-in for the API's batch ingestion endpoint, recording arrivals"""
+
+    def __init__(self, port=RECEIVER_PORT):
+        self.port = port
+        self.received = 0
+        self.latencies_ms = []
+        self.recent = []  # Recently received originals (probes for searchability)
+        self._lock = threading.Lock()
+
+    def start(self):
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                now = time.time()
+                events = [json.loads(line) for line in body.decode("utf-8").splitlines() if line.strip()]
+                receiver.record(events, now)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(b'{"status": "ok"}')
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def record(self, events, now):
+        with self._lock:
+            self.received += len(events)
+            for event in events:
+                self.latencies_ms.append((now - float(event.get("timestamp", now))) * 1000)
+            # Near-duplicates are kept out of the index: never probe for them
+            originals = [event for event in events if not event.get("duplicate_of")]
+            self.recent = (self.recent + originals)[-100:]
+
+    def newest(self):
+        """Newest received original (indexable) event, or None"""
+        with self._lock:
+            return self.recent[-1] if self.recent else None
+
+
+# ========== MEASUREMENT DRIVER ==========
+
+def wait_for(url, timeout):
+    """Poll ``url`` until it answers (any status) or ``timeout`` passes"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            requests.post(url, json={"messages": "ping"}, timeout=5)
+            return True
+        except requests.RequestException:
+            time.sleep(0.5)
+    return False
+
+
+def wait_ready(readyz_url, timeout):
+    """Poll a /readyz endpoint until it answers 200 (models warm)"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(readyz_url, timeout=5).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    return False
+
+
+def probe_searchable(retrieve_url, event, timeout=30):
+    """Query for one received event until retrieval returns it
+
+    Returns:
+        float or None: Milliseconds from the event timestamp to searchability
+    """
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            docs = requests.post(retrieve_url, json={"messages": event["text"]}, timeout=10).json()
+            if any(doc.get("metadata", {}).get("url") == event["url"] for doc in docs):
+                return (time.time() - float(event["timestamp"])) * 1000
+        except (requests.RequestException, ValueError):
+            pass
+        time.sleep(0.05)
+    return None
+
+
+def query_once(query_url, question):
+    start = time.perf_counter()
+    response = requests.post(query_url, json={"messages": question}, timeout=120)
+    return (time.perf_counter() - start) * 1000, response.status_code
+
+
+def drive(args, receiver, retrieve_url, query_url):
+    """Warm up, measure for ``args.duration`` seconds and return the results dict"""
+    if not wait_for(retrieve_url, args.startup_timeout):
+        return {"error": "retrieval route did not come up"}
+    if not wait_ready(query_url.replace("/v1/query", "/readyz"), args.startup_timeout):
+        return {"error": "models did not warm up"}
+    print(f"⏱️ [E2E] Pipeline up, warming up for {args.warmup}s")
+    time.sleep(args.warmup)
+
+    start_received = receiver.received
+    start_latencies = len(receiver.latencies_ms)
+    start = time.time()
+    searchable_ms, probes_missed = [], 0
+    query_ms, query_statuses = [], {}
+
+    def run_queries():
+        questions = [f"What is happening in {place}?" for place in ("Kyiv", "Gaza", "Taipei", "Khartoum")]
+        with ThreadPoolExecutor(max_workers=args.query_concurrency) as pool:
+            i = 0
+            while time.time() - start < args.duration:
+                batch = [questions[(i + j) % len(questions)] + f" ({i + j})" for j in range(args.query_concurrency)]
+                i += args.query_concurrency
+                for latency, status in pool.map(lambda q: query_once(query_url, q), batch):
+                    query_statuses[status] = query_statuses.get(status, 0) + 1
+                    if status == 200:
+                        query_ms.append(latency)
+
+    query_thread = threading.Thread(target=run_queries, daemon=True)
+    query_thread.start()
+
+    # Searchability probes: newest delivered original, one at a time
+    while time.time() - start < args.duration:
+        event = receiver.newest()
+        if event is None:
+            time.sleep(0.1)
+            continue
+        latency = probe_searchable(retrieve_url, event)
+        if latency is None:
+            probes_missed += 1
+        else:
+            searchable_ms.append(latency)
+        time.sleep(args.probe_interval)
+
+    elapsed = time.time() - start
+    query_thread.join(timeout=130)
+
+    return {
+        "ingest_events_per_s": round((receiver.received - start_received) / elapsed, 1),
+        "events_received": receiver.received - start_received,
+        "searchable_ms": percentiles(searchable_ms),
+        "searchable_probes_missed": probes_missed,
+        "feed_ms": percentiles(receiver.latencies_ms[start_latencies:]),
+        "query_ms": percentiles(query_ms),
+        "query_statuses": {str(k): v for k, v in query_statuses.items()},
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "measured_seconds": round(elapsed, 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=200, help="Simulated events per second")
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default="constant")
+    parser.add_argument("--burst", type=int, default=1, help="Events per arrival")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=10, help="Seconds ignored after startup")
+    parser.add_argument("--probe-interval", type=float, default=0.5, help="Seconds between searchability probes")
+    parser.add_argument("--query-concurrency", type=int, default=4, help="Concurrent /v1/query clients")
+    parser.add_argument("--llm-delay", type=float, default=50, help="Stub LLM milliseconds per batch")
+    parser.add_argument("--startup-timeout", type=float, default=300, help="Seconds to wait for the pipeline")
+    parser.add_argument("--output", default="e2e_results.json", help="JSON results file")
+    args = parser.parse_args()
+
+    # Load-generator mode; fresh caches so the run measures real embedding work
+    os.environ["FLASHPOINT_SIM_RATE"] = str(args.rate)
+    os.environ["FLASHPOINT_SIM_ARRIVAL"] = args.arrival
+    os.environ["FLASHPOINT_SIM_BURST"] = str(args.burst)
+    os.environ.setdefault("FLASHPOINT_EMBED_CACHE_DIR", tempfile.mkdtemp(prefix="flashpoint-e2e-"))
+    os.environ.setdefault("FLASHPOINT_PERSIST_DIR", "")  # Cold start: no replay of earlier runs
+
+    import main as pipeline
+
+    def generate_batch(prompts):
+        time.sleep(args.llm_delay / 1000)
+        return [f"Stub answer ({len(prompt)} prompt chars)" for prompt in prompts]
+
+    receiver = FeedReceiver()
+    receiver.start()
+    retrieve_url = f"http://127.0.0.1:{os.getenv('FLASHPOINT_RETRIEVE_PORT', 8012)}/v1/retrieve"
+    query_url = f"http://127.0.0.1:{QUERY_PORT}/v1/query"
+
+    def measure():
+        started = time.strftime("%Y-%m-%dT%H:%M:%S")
+        try:
+            results = drive(args, receiver, retrieve_url, query_url)
+        except Exception as e:
+            results = {"error": str(e)}
+        report = {
+            "benchmark": "e2e",
+            "commit": git_commit(),
+            "started": started,
+            "config": vars(args),
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(json.dumps(results, indent=2))
+        print(f"💾 [E2E] Results written to {args.output}")
+        sys.stdout.flush()
+        # Pathway owns the main thread and runs forever: end the process here
+        os._exit(0 if "error" not in results else 1)
+
+    threading.Thread(target=measure, name="flashpoint-e2e", daemon=True).start()
+    pipeline.run(
+        simulate=True,
+        stream_url=f"http://127.0.0.1:{RECEIVER_PORT}/v1/stream/batch",
+        generate_batch=generate_batch,
+        query_port=QUERY_PORT,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Embedder Benchmark: PyTorch vs ONNX Runtime (fp32 / int8) on CPU
+
+Embeds a synthetic news corpus (simulation templates with random places and
+details) with each backend and reports:
+
+- docs_per_s: embedding throughput at the given batch size / thread count
+- cosine_to_torch: mean cosine between a backend's vector and the PyTorch
+  vector of the same document (1.0 = identical)
+- recall_at_k: share of PyTorch's top-k documents per query that the
+  backend also ranks in its top-k (retrieval agreement)
+
+Requires: pip install onnxruntime (plus sentence-transformers for the
+PyTorch baseline, included in pathway[xpack-llm-local])
+
+Usage (from backend/):
+    python -m benchmarks.embedder_compare --docs 2000 --threads 4 --output embedders.json
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+from gazetteer import SEED_PLACES
+from onnx_embedder import OnnxEmbedder
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "data", "dummy.jsonl")
+MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DETAILS = [
+    "Officials confirmed casualties.", "Power outages were reported.", "Roads into the city are closed.",
+    "Aid convoys are delayed.", "Residents are evacuating.", "Communications remain down.",
+]
+
+
+def build_texts(n_docs, n_queries, rng):
+    """Synthetic documents and place-centric queries"""
+    with open(CORPUS_PATH) as f:
+        templates = [json.loads(line)["text"] for line in f if line.strip()]
+    places = [place[0] for place in SEED_PLACES]
+    docs = []
+    for _ in range(n_docs):
+        place = rng.choice(places)
+        text = rng.choice(templates).replace("Border Region X", place)
+        docs.append(f"{text} {rng.choice(DETAILS)}" if place in text else f"{place}: {text} {rng.choice(DETAILS)}")
+    queries = [f"What is happening in {rng.choice(places)}?" for _ in range(n_queries)]
+    return docs, queries
+
+
+def timed_embed(embed, texts):
+    """Returns (vectors as a matrix, docs/s)"""
+    embed(texts[:32])  # Warm-up (graph optimization, allocations)
+    started = time.perf_counter()
+    vectors = np.asarray(embed(texts), dtype=np.float32)
+    return vectors, len(texts) / (time.perf_counter() - started)
+
+
+def top_k(doc_vectors, query_vectors, k):
+    scores = query_vectors @ doc_vectors.T
+    return [set(row) for row in np.argpartition(-scores, k, axis=1)[:, :k]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=2000, help="Documents to embed")
+    parser.add_argument("--queries", type=int, default=200, help="Queries for retrieval agreement")
+    parser.add_argument("--k", type=int, default=5, help="Top-k for retrieval agreement")
+    parser.add_argument("--batch-size", type=int, default=64, help="Texts per model call")
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads (0: runtime default)")
+    parser.add_argument("--max-tokens", type=int, default=256, help="Truncation length")
+    parser.add_argument("--output", default="embedder_results.json", help="JSON results file")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    docs, queries = build_texts(args.docs, args.queries, rng)
+
+    # ========== PYTORCH BASELINE ==========
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    model = SentenceTransformer(MODEL, device="cpu")
+    model.max_seq_length = args.max_tokens
+
+    def torch_embed(texts):
+        return model.encode(texts, batch_size=args.batch_size, normalize_embeddings=True)
+
+    base_docs, base_rate = timed_embed(torch_embed, docs)
+    base_queries = np.asarray(torch_embed(queries), dtype=np.float32)
+    base_top = top_k(base_docs, base_queries, args.k)
+    results = {"torch": {"docs_per_s": round(base_rate, 1), "cosine_to_torch": 1.0, "recall_at_k": 1.0}}
+    print(f"  torch: {base_rate:,.0f} docs/s")
+
+    # ========== ONNX RUNTIME ==========
+    for quantize in (False, True):
+        embedder = OnnxEmbedder(
+            MODEL, quantize=quantize, batch_size=args.batch_size,
+            threads=args.threads or None, max_tokens=args.max_tokens,
+        )
+        embedder.load_model()
+        vectors, rate = timed_embed(embedder.__wrapped__, docs)
+        query_vectors = np.asarray(embedder.__wrapped__(queries), dtype=np.float32)
+        found = top_k(vectors, query_vectors, args.k)
+        recall = np.mean([len(a & b) / args.k for a, b in zip(base_top, found)])
+        cosine = float(np.mean(np.sum(vectors * base_docs, axis=1)))
+        results[f"onnx-{embedder.variant}"] = {
+            "docs_per_s": round(rate, 1),
+            "speedup": round(rate / base_rate, 2),
+            "cosine_to_torch": round(cosine, 4),
+            "recall_at_k": round(float(recall), 4),
+        }
+        print(f"{'onnx-' + embedder.variant:>9}: {rate:,.0f} docs/s ({rate / base_rate:.1f}x), "
+              f"cosine {cosine:.4f}, recall@{args.k} {recall:.3f}")
+
+    with open(args.output, "w") as f:
+        json.dump({"benchmark": "embedder_compare", "config": vars(args), "results": results}, f, indent=2)
+    print(f"💾 Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
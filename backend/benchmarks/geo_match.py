@@ -0,0 +1,86 @@
+"""Gazetteer Matching Benchmark: per-event place resolution latency
+
+Compiles a synthetic GeoNames-scale gazetteer (or loads a real one built
+with tools/build_gazetteer.py), memory-maps it and times ``locate`` over
+simulation-corpus texts with random place mentions injected.
+
+Usage (from backend/):
+    python -m benchmarks.geo_match --places 50000
+    python -m benchmarks.geo_match --gazetteer ../data/gazetteer.bin
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from gazetteer import LEVEL_CITY, LEVEL_COUNTRY, Gazetteer, compile_gazetteer
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "data", "dummy.jsonl")
+SYLLABLES = ["ka", "ri", "vo", "lan", "mar", "tes", "do", "gra", "ul", "pen", "sko", "ber", "zan", "ti", "nor", "avi"]
+
+
+def synthetic_places(n, rng):
+    """Generate ``n`` places with 1-4 aliases each (some names shared -> ambiguity)"""
+    def word():
+        return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+    places, names = [], []
+    for i in range(n):
+        name = rng.choice(names) if names and rng.random() < 0.05 else word()
+        if rng.random() < 0.1:
+            name = f"{name} {word()}"  # Multi-word names
+        aliases = [word() for _ in range(rng.randint(1, 4))]
+        level = LEVEL_COUNTRY if i % 200 == 0 else LEVEL_CITY
+        places.append((name, aliases, rng.uniform(-80, 80), rng.uniform(-180, 180), rng.randint(0, 10_000_000), level))
+        names.append(name)
+    return places
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--places", type=int, default=50000, help="Synthetic gazetteer size")
+    parser.add_argument("--gazetteer", help="Compiled gazetteer to benchmark instead")
+    parser.add_argument("--events", type=int, default=5000)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    path = args.gazetteer
+    if not path:
+        places = synthetic_places(args.places, rng)
+        start = time.perf_counter()
+        blob = compile_gazetteer(places)
+        print(f"compile: {len(places)} places -> {len(blob) / 1e6:.1f} MB in {time.perf_counter() - start:.1f}s")
+        fd, path = tempfile.mkstemp(suffix=".bin")
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+
+    start = time.perf_counter()
+    gazetteer = Gazetteer.load(path)
+    print(f"load (mmap): {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    with open(CORPUS_PATH) as f:
+        templates = [json.loads(line)["text"] for line in f if line.strip()]
+    mentions = [gazetteer.place_name(rng.randrange(gazetteer.n_places)) for _ in range(256)]
+    texts = [f"{rng.choice(templates)} Reports from {rng.choice(mentions)}." for _ in range(args.events)]
+
+    latencies, hits = [], 0
+    for text in texts:
+        t0 = time.perf_counter()
+        hits += gazetteer.locate(text) is not None
+        latencies.append((time.perf_counter() - t0) * 1e6)
+
+    latencies.sort()
+    print(
+        f"locate: {len(texts)} events, avg {len(texts[0])} chars, resolved {hits} | "
+        f"p50 {statistics.median(latencies):.0f} us  p99 {latencies[int(len(latencies) * 0.99)]:.0f} us"
+    )
+    if not args.gazetteer:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Ingestion Throughput Benchmark: per-row vs batched API delivery
+
+Replays the simulation corpus (data/dummy.jsonl, repeated to N events)
+through a static Pathway table and delivers it to an in-process API
+receiver twice:
+
+- row:   pw.io.http.write -> POST /v1/stream (one request per row)
+- batch: write_batched    -> POST /v1/stream/batch (one request per commit)
+
+Usage (from backend/):
+    python -m benchmarks.ingest_throughput --events 5000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+import pathway as pw
+import uvicorn
+from pathway.internals.parse_graph import G
+
+# Never restore or overwrite the real feed snapshot (read when api is imported)
+os.environ["FLASHPOINT_FEED_SNAPSHOT"] = ""
+
+import api
+from batch_writer import write_batched
+from data_registry import InputSchema
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "data", "dummy.jsonl")
+PORT = 8765
+
+
+def build_corpus(n_events):
+    """Write ``n_events`` simulation events (corpus repeated) to a temp JSONL file"""
+    with open(CORPUS_PATH) as f:
+        templates = [json.loads(line) for line in f if line.strip()]
+
+    fd, path = tempfile.mkstemp(suffix=".jsonl")
+    with os.fdopen(fd, "w") as f:
+        for i in range(n_events):
+            event = dict(templates[i % len(templates)])
+            event["text"] = f"{event['text']} #{i}"
+            event["timestamp"] = time.time()
+            f.write(json.dumps(event) + "\n")
+    return path
+
+
+def start_receiver():
+    """Run the real API app on a background thread"""
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def run_mode(mode, corpus_path, n_events, batch_size, timeout=600):
+    """Deliver the corpus with one writer and return (seconds, requests)"""
+    G.clear()
+    table = pw.io.jsonlines.read(corpus_path, schema=InputSchema, mode="static")
+
+    writer = None
+    if mode == "row":
+        pw.io.http.write(table, url=f"http://127.0.0.1:{PORT}/v1/stream", method="POST", format="json")
+    else:
+        writer = write_batched(table, url=f"http://127.0.0.1:{PORT}/v1/stream/batch", max_batch_size=batch_size)
+
+    start_seq = api.last_seq
+    start = time.perf_counter()
+    pw.run(monitoring_level=pw.MonitoringLevel.NONE)
+
+    # Wait until the receiver has accepted every event
+    deadline = start + timeout
+    while api.last_seq - start_seq < n_events and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    received = api.last_seq - start_seq
+    requests_sent = writer.sent_requests if writer else received
+    return elapsed, received, requests_sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=5000, help="Events to deliver per mode")
+    parser.add_argument("--batch-size", type=int, default=500, help="Max rows per batch request")
+    args = parser.parse_args()
+
+    corpus_path = build_corpus(args.events)
+    start_receiver()
+
+    results = {}
+    try:
+        for mode in ("row", "batch"):
+            elapsed, received, requests_sent = run_mode(mode, corpus_path, args.events, args.batch_size)
+            results[mode] = received / elapsed
+            print(
+                f"{mode:>5}: {received}/{args.events} events in {elapsed:.2f}s "
+                f"-> {received / elapsed:,.0f} events/s over {requests_sent} requests"
+            )
+    finally:
+        os.remove(corpus_path)
+
+    if results.get("row"):
+        print(f"speedup: {results['batch'] / results['row']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
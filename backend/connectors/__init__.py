@@ -2,11 +2,13 @@
 
 This package contains Pathway-compatible connector implementations for various data sources:
 
-- news_src.py: GNews API polling connector
-- reddit_src.py: Reddit public API polling connector
 - telegram_src.py: Telegram real-time streaming connector
-- rss_src.py: RSS feed polling connector (multiple sources)
 - sim_src.py: Simulation/test data connector (JSONL file)
+- dedup.py: Bounded, persistent seen-item store shared by the live connectors
+- schedule.py: Adaptive polling interval (activity, backoff, rate-limit headers)
+- runtime.py: Asyncio runtime polling every feed in feeds.toml (RSS, GNews, Reddit)
+  on one thread, with adaptive scheduling (schedule.py) and HTML cleaning of
+  entries (clean_html); the live pipeline uses it instead of per-feed pollers
 
 All connectors inherit from pw.io.python.ConnectorSubject and emit events in InputSchema format.
 Each connector can operate in polling mode (scheduled) or streaming mode (event-driven).
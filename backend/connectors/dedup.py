@@ -0,0 +1,199 @@
+"""Bounded, Persistent Seen-Item Store for FlashPoint Connectors
+
+Connectors remember which items (URLs, post ids, message links) they have
+already emitted. Plain sets grow without bound, clearing them re-emits the
+current page, and neither survives a restart. This store is a time-windowed
+rotating Bloom filter with a fixed memory budget, snapshotted to disk.
+
+Structure:
+- ``generations`` Bloom filters, each covering ``window / generations`` seconds
+- Inserts go to the newest generation; lookups check all of them
+- When the newest generation's time slice ends, the oldest one is cleared
+  and reused, so items are forgotten after roughly ``window`` seconds
+
+Features:
+- Fixed memory: generations x m bits, sized from capacity and target FP rate
+- No false negatives within the window; false positives bounded by ``fp_rate``
+- Snapshot to ``<snapshot_dir>/<name>.npz`` (periodic, atomic, and at exit)
+- Metrics: memory bytes, fill ratio, estimated current false-positive rate,
+  exported per store as Prometheus gauges
+- Empty keys (items without a link / id) are never deduplicated
+"""
+
+import atexit
+import hashlib
+import math
+import os
+import re
+import threading
+import time
+
+import numpy as np
+
+from metrics import DEDUP_FILL, DEDUP_FP_RATE, DEDUP_MEMORY
+
+# Default snapshot location (relative to backend/, like the embedding cache)
+DEFAULT_SNAPSHOT_DIR = os.getenv("FLASHPOINT_DEDUP_DIR", os.path.join("..", "data", "dedup"))
+
+
+class SeenStore:
+    """Rotating Bloom filter of seen keys with disk snapshots
+
+    Attributes:
+        name (str): Store name (snapshot file name)
+        capacity (int): Expected distinct keys per generation
+        fp_rate (float): Target false-positive rate at capacity
+        window (float): Seconds an item is remembered (at least)
+        m (int): Bits per generation
+        k (int): Hash functions
+    """
+
+    def __init__(self, name, capacity=20_000, fp_rate=0.001, window=7 * 86400, generations=4,
+                 snapshot_dir=DEFAULT_SNAPSHOT_DIR, snapshot_every=60):
+        self.name = name
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.window = window
+        self.generations = generations
+        self.slice_seconds = window / generations
+        self.snapshot_every = snapshot_every
+
+        # Optimal Bloom sizing for capacity n and FP rate p (split over generations)
+        per_generation_fp = fp_rate / generations
+        self.m = int(math.ceil(-capacity * math.log(per_generation_fp) / math.log(2) ** 2 / 8)) * 8
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+
+        self.bits = np.zeros((generations, self.m // 8), dtype=np.uint8)
+        self.starts = np.zeros(generations, dtype=np.float64)  # Slice start time per generation
+        self.counts = np.zeros(generations, dtype=np.int64)  # Inserts per generation
+        self.current = 0
+        self.starts[0] = time.time()
+        self.hits = 0
+        self.lookups = 0
+        self._dirty = False
+        self._last_snapshot = time.time()
+        self._lock = threading.Lock()
+
+        file_name = re.sub(r"[^\w.-]+", "_", name)
+        self.path = os.path.join(snapshot_dir, f"{file_name}.npz") if snapshot_dir else None
+        if self.path:
+            os.makedirs(snapshot_dir, exist_ok=True)
+            self._load()
+            atexit.register(self.snapshot)
+
+        # Evaluated at scrape time
+        DEDUP_MEMORY.labels(store=name).set(self.bits.nbytes)
+        DEDUP_FILL.labels(store=name).set_function(lambda: self.stats()["fill_ratio"])
+        DEDUP_FP_RATE.labels(store=name).set_function(lambda: self.stats()["fp_rate_estimate"])
+
+    # ========== HASHING ==========
+
+    def _positions(self, key):
+        """k bit positions via double hashing of a 128-bit digest"""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return np.array([(h1 + i * h2) % self.m for i in range(self.k)], dtype=np.int64)
+
+    def _contains(self, generation, positions):
+        row = self.bits[generation]
+        return bool(np.all(row[positions >> 3] & (1 << (positions & 7)).astype(np.uint8)))
+
+    # ========== ROTATION ==========
+
+    def _rotate(self, now):
+        """Advance to a fresh generation when the current time slice has ended"""
+        while now - self.starts[self.current] >= self.slice_seconds:
+            self.current = (self.current + 1) % self.generations
+            self.bits[self.current] = 0
+            self.counts[self.current] = 0
+            self.starts[self.current] = now
+            self._dirty = True
+
+    # ========== PUBLIC API ==========
+
+    def check_and_add(self, key):
+        """Record ``key`` and report whether it had been seen before
+
+        Args:
+            key (str): Item identity (URL, post id, ...)
+
+        Returns:
+            bool: True if the key was (probably) already seen; always False
+            for an empty key, which identifies nothing
+        """
+        if not key:
+            return False
+        positions = self._positions(key)
+        now = time.time()
+        with self._lock:
+            self._rotate(now)
+            self.lookups += 1
+            if any(self._contains(g, positions) for g in range(self.generations)):
+                self.hits += 1
+                return True
+            row = self.bits[self.current]
+            np.bitwise_or.at(row, positions >> 3, (1 << (positions & 7)).astype(np.uint8))
+            self.counts[self.current] += 1
+            self._dirty = True
+            if self.path and now - self._last_snapshot >= self.snapshot_every:
+                self._snapshot_locked()
+        return False
+
+    def __contains__(self, key):
+        if not key:
+            return False
+        positions = self._positions(key)
+        with self._lock:
+            return any(self._contains(g, positions) for g in range(self.generations))
+
+    # ========== PERSISTENCE ==========
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as snapshot:
+                if snapshot["bits"].shape != self.bits.shape or int(snapshot["k"]) != self.k:
+                    print(f"⚠️ [Dedup] {self.name}: snapshot sizing changed, starting empty")
+                    return
+                self.bits[:] = snapshot["bits"]
+                self.starts[:] = snapshot["starts"]
+                self.counts[:] = snapshot["counts"]
+                self.current = int(snapshot["current"])
+            print(f"💾 [Dedup] {self.name}: restored {int(self.counts.sum())} keys from {self.path}")
+        except Exception as e:
+            print(f"⚠️ [Dedup] {self.name}: unreadable snapshot ({e}), starting empty")
+
+    def _snapshot_locked(self):
+        tmp_path = self.path + ".tmp.npz"
+        np.savez(tmp_path, bits=self.bits, starts=self.starts, counts=self.counts,
+                 current=self.current, k=self.k)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        self._last_snapshot = time.time()
+
+    def snapshot(self):
+        """Write the filter to disk if it changed since the last snapshot"""
+        if not self.path:
+            return
+        with self._lock:
+            if self._dirty:
+                self._snapshot_locked()
+
+    # ========== METRICS ==========
+
+    def stats(self):
+        with self._lock:
+            fill = np.unpackbits(self.bits, axis=1).mean(axis=1)
+            # A lookup is a false positive if any generation matches spuriously
+            fp_estimate = 1 - np.prod(1 - fill ** self.k)
+            return {
+                "name": self.name,
+                "keys": int(self.counts.sum()),
+                "memory_bytes": int(self.bits.nbytes),
+                "fill_ratio": round(float(fill.max()), 4),
+                "fp_rate_estimate": float(fp_estimate),
+                "hits": self.hits,
+                "lookups": self.lookups,
+            }
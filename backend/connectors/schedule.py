@@ -0,0 +1,117 @@
+"""Adaptive Polling Schedule for FlashPoint Connectors
+
+Fixed polling intervals are wrong twice: too slow while a source is busy
+during a breaking event, and wasteful while it is quiet or failing. This
+schedule adapts the interval of one source after every poll.
+
+Features:
+- Busy source (many new items): interval halves, down to ``min_interval``
+- Quiet source (nothing new): interval grows 1.5x, up to ``max_interval``
+- Failing / rate-limited source: exponential backoff from the base interval
+- Server hints win: ``Retry-After`` and ``X-Ratelimit-Remaining`` /
+  ``X-Ratelimit-Reset`` set a lower bound on the next delay
+"""
+
+import time
+from email.utils import parsedate_to_datetime
+
+# Statuses that mean "slow down" rather than "nothing new"
+THROTTLE_STATUSES = {403, 429, 503}
+# Reset values above this are absolute Unix timestamps, below are seconds from now
+EPOCH_THRESHOLD = 1_000_000_000
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def rate_limit_delay(headers, now=None):
+    """Minimum seconds before the next request, as requested by the server
+
+    Understands ``Retry-After`` (seconds or HTTP date) and the
+    ``X-Ratelimit-Remaining`` / ``X-Ratelimit-Reset`` pair (Reddit, many
+    APIs): with budget left, requests are spread evenly over the reset
+    window; with none left, wait for the reset.
+
+    Args:
+        headers: Case-insensitive response headers (requests / aiohttp)
+
+    Returns:
+        float or None: Delay in seconds, or None without hints
+    """
+    if not headers:
+        return None
+    now = now or time.time()
+    delays = []
+
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        seconds = _number(retry_after)
+        if seconds is None:
+            try:
+                seconds = parsedate_to_datetime(retry_after).timestamp() - now
+            except (TypeError, ValueError):
+                seconds = None
+        if seconds is not None:
+            delays.append(max(0.0, seconds))
+
+    remaining = _number(headers.get("X-Ratelimit-Remaining"))
+    reset = _number(headers.get("X-Ratelimit-Reset"))
+    if remaining is not None and reset is not None:
+        if reset > EPOCH_THRESHOLD:
+            reset -= now
+        reset = max(0.0, reset)
+        delays.append(reset if remaining < 1 else reset / remaining)
+
+    return max(delays) if delays else None
+
+
+class AdaptiveSchedule:
+    """Per-source polling interval that reacts to yield, errors and rate limits
+
+    Attributes:
+        base_interval (float): Configured interval (backoff starts here)
+        interval (float): Current interval
+        min_interval (float): Fastest allowed polling
+        max_interval (float): Slowest polling (quiet or failing source)
+        burst_items (int): New items per poll that count as "busy"
+        failures (int): Consecutive failed / throttled polls
+    """
+
+    def __init__(self, interval, min_interval=None, max_interval=None, burst_items=5):
+        self.base_interval = interval
+        self.interval = interval
+        self.min_interval = min_interval or max(interval / 4, 5)
+        self.max_interval = max_interval or interval * 8
+        self.burst_items = burst_items
+        self.failures = 0
+
+    def record(self, new_items=0, status=200, headers=None):
+        """Update the interval from one poll's outcome
+
+        Args:
+            new_items (int): Unseen items the poll produced
+            status (int or None): HTTP status (None for network errors)
+            headers: Response headers (rate-limit hints)
+
+        Returns:
+            float: Seconds to wait before the next poll
+        """
+        if status is None or status in THROTTLE_STATUSES or status >= 500:
+            self.failures += 1
+            self.interval = min(self.max_interval, self.base_interval * 2 ** self.failures)
+        else:
+            self.failures = 0
+            if new_items >= self.burst_items:
+                self.interval = max(self.min_interval, self.interval / 2)
+            elif new_items > 0:
+                # Some activity: drop back to the base rate if we had slowed down
+                self.interval = max(self.min_interval, min(self.interval, self.base_interval))
+            else:
+                self.interval = min(self.max_interval, self.interval * 1.5)
+
+        hint = rate_limit_delay(headers)
+        return max(self.interval, hint) if hint is not None else self.interval
@@ -9,38 +9,85 @@ Use cases:
 - Demo mode with controlled data flow
 
 Each line in the JSONL file is treated as an event (must match InputSchema).
+
+Modes:
+- Replay (default): emit the file line by line, ``interval`` seconds apart
+- Load generator (``rate`` > 0): use the file as a template corpus and emit
+  ``rate`` events/s (constant spacing or a Poisson process, optionally in
+  bursts), with randomized place mentions and detail sentences and unique
+  URLs, in committed batches - for capacity tests of ingest → embed → index
+  → feed. Generated events are variants of a few templates, so the pipeline
+  skips the near-duplicate stage for them by default (see data_registry)
 """
 
 import pathway as pw
 import json
 import time
 import os
+import random
+
+from gazetteer import SEED_PLACES
+from metrics import CONNECTOR_EMITTED
+
+# Placeholder place in the demo corpus, swapped for a random place in load mode
+PLACEHOLDER_PLACE = "Border Region X"
+# Seconds between achieved-rate log lines in load mode
+RATE_LOG_INTERVAL = 10
+# Longest sleep between batches (keeps the schedule responsive at low rates)
+MAX_TICK = 0.05
+# Detail sentences mixed into generated events
+DETAILS = [
+    "Officials confirmed casualties.", "Power outages were reported.", "Roads into the city are closed.",
+    "Aid convoys are delayed.", "Residents are evacuating.", "Communications remain down.",
+    "Drone activity was observed overnight.", "Air defense sirens sounded twice.",
+    "Fuel shortages are spreading.", "Hospitals report heavy intake.",
+]
+
 
 class SimulationSource(pw.io.python.ConnectorSubject):
-    """Simulation connector: reads JSONL file and emits events at controlled rate"""
+    """Simulation connector: replays a JSONL file, or generates load from it"""
     
-    def __init__(self, file_path, interval=5):
+    def __init__(self, file_path, interval=5, rate=0, arrival="constant", burst_size=1, seed=None):
         """Initialize simulation source
         
         Args:
-            file_path (str): Path to JSONL file with test events
-            interval (int): Delay in seconds between event emissions
+            file_path (str): Path to JSONL file with test events (template corpus in load mode)
+            interval (int): Delay in seconds between event emissions (replay mode)
+            rate (float): Target events per second; > 0 enables load-generator mode
+            arrival (str): "constant" (evenly spaced) or "poisson" (random arrivals)
+            burst_size (int): Events per arrival; bursts arrive at rate / burst_size
+            seed (int): Random seed for reproducible load
         """
         # 1. CRITICAL: Must initialize the parent class
         super().__init__()
         self.file_path = file_path
         self.interval = interval
+        self.rate = rate
+        self.arrival = arrival
+        self.burst_size = max(1, int(burst_size))
+        self.random = random.Random(seed)
+        self.places = [place[0] for place in SEED_PLACES]
+        self.emitted = 0
+
+    def _load_corpus(self):
+        """Read and parse the JSONL file once (malformed lines are skipped)"""
+        corpus = []
+        with open(self.file_path, "r") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        corpus.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        return corpus
 
     def run(self):
-        """Main execution loop: read JSONL file and stream events
+        """Main execution loop: stream events from the JSONL file
         
         Process:
-        1. Load entire file into memory
-        2. Parse each JSON line
-        3. Update timestamp to current time
-        4. Emit to Pathway
-        5. Sleep between events
-        6. Repeat infinitely
+        1. Load and parse the file once
+        2. Replay mode: emit each event with a fresh timestamp, sleep, repeat forever
+        3. Load mode: emit randomized events at the target rate in committed batches
         """
         # ========== FILE VALIDATION ==========
         # 2. Check path exists
@@ -48,44 +95,100 @@ class SimulationSource(pw.io.python.ConnectorSubject):
             print(f"❌ [Sim] File not found: {self.file_path}")
             return
 
+        corpus = self._load_corpus()
+        if not corpus:
+            print(f"❌ [Sim] No events in {self.file_path}")
+            return
+
+        if self.rate > 0:
+            self._generate_load(corpus)
+        else:
+            self._replay(corpus)
+
+    def _replay(self, corpus):
         print(f"🚀 [Sim] Starting Simulation Loop from: {self.file_path}")
         
         # ========== MAIN LOOP ==========
         # 3. Infinite Loop (restart from beginning when EOF reached)
         while True:
-            try:
-                # Read entire file
-                with open(self.file_path, "r") as f:
-                    lines = f.readlines()
-
-                # ========== PROCESS EACH LINE ==========
-                for line in lines:
-                    if line.strip():  # Skip empty lines
-                        try:
-                            # Parse JSON line
-                            data = json.loads(line)
-                            
-                            # ========== TIMESTAMP INJECTION ==========
-                            # Update timestamp to NOW (not historical)
-                            data["timestamp"] = time.time()
-                            
-                            # ========== EMIT TO PATHWAY ==========
-                            # 4. Push data to Pathway engine
-                            self.next(**data)
-                            
-                            # Log injection
-                            print(f"🎭 [Sim] Injected: {data.get('text', '')[:30]}...")
-                            
-                            # ========== FLOW CONTROL ==========
-                            # Sleep between events (configurable rate)
-                            time.sleep(self.interval)
-                            
-                        except json.JSONDecodeError:
-                            # Skip malformed lines
-                            continue
-                            
-            except Exception as e:
-                # Handle file read errors
-                print(f"⚠️ [Sim] Read Error: {e}")
-                time.sleep(1)
-                # Will retry reading the file
\ No newline at end of file
+            for template in corpus:
+                data = dict(template)
+                
+                # ========== TIMESTAMP INJECTION ==========
+                # Update timestamp to NOW (not historical)
+                data["timestamp"] = time.time()
+                
+                # ========== EMIT TO PATHWAY ==========
+                # 4. Push data to Pathway engine
+                self.next(**data)
+                CONNECTOR_EMITTED.labels(connector="Simulation").inc()
+                
+                # Log injection
+                print(f"🎭 [Sim] Injected: {data.get('text', '')[:30]}...")
+                
+                # ========== FLOW CONTROL ==========
+                # Sleep between events (configurable rate)
+                time.sleep(self.interval)
+
+    # ========== LOAD GENERATOR ==========
+
+    def _synthesize(self, template):
+        """Randomized variant of a template event
+
+        Random place and two random detail sentences, so generated events
+        spread over regions and read like distinct reports.
+        """
+        place = self.random.choice(self.places)
+        text = template.get("text", "")
+        if PLACEHOLDER_PLACE in text:
+            text = text.replace(PLACEHOLDER_PLACE, place)
+        else:
+            text = f"{place}: {text}"
+        details = " ".join(self.random.sample(DETAILS, 2))
+        self.emitted += 1
+        return {
+            "text": f"{text} {details}",
+            "source": template.get("source", "Simulation"),
+            "url": f"https://sim.flashpoint.local/{self.emitted}",
+            "timestamp": time.time(),
+            "bias": template.get("bias", "Neutral"),
+        }
+
+    def _arrivals(self, elapsed):
+        """Events due by ``elapsed`` seconds since the start of the run"""
+        if self.arrival == "poisson":
+            # Poisson process of bursts: advance a precomputed next-arrival time
+            due = 0
+            while self._next_arrival <= elapsed:
+                due += self.burst_size
+                self._next_arrival += self.random.expovariate(self.rate / self.burst_size)
+            return due
+        # Constant rate: emit exactly rate * elapsed events (bursts of burst_size)
+        target = int(elapsed * self.rate)
+        return target - target % self.burst_size - self._scheduled
+
+    def _generate_load(self, corpus):
+        print(f"🚀 [Sim] Load generator: {self.rate:g} ev/s ({self.arrival}, bursts of {self.burst_size})")
+        start = time.perf_counter()
+        self._scheduled = 0
+        self._next_arrival = self.random.expovariate(self.rate / self.burst_size)
+        last_log, last_count = start, 0
+
+        while True:
+            now = time.perf_counter()
+            due = self._arrivals(now - start)
+            if due:
+                # One commit per batch: the engine sees the batch atomically
+                for _ in range(due):
+                    self.next(**self._synthesize(self.random.choice(corpus)))
+                self.commit()
+                CONNECTOR_EMITTED.labels(connector="Simulation").inc(due)
+                self._scheduled += due
+
+            if now - last_log >= RATE_LOG_INTERVAL:
+                achieved = (self._scheduled - last_count) / (now - last_log)
+                print(f"🎭 [Sim] {achieved:.1f} ev/s (target {self.rate:g}), {self._scheduled} total")
+                last_log, last_count = now, self._scheduled
+
+            # Sleep until roughly the next event is due
+            time.sleep(min(MAX_TICK, max(self.burst_size / self.rate / 2, 0.0005)))
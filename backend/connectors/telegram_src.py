@@ -8,11 +8,14 @@ Features:
 - Session persistence (no re-auth required)
 - Dual-mode: historical backfill + live streaming
 - Message metadata extraction (sender, URL, timestamp)
+- Deduplication by message URL (backfill after restart skips known messages)
 """
 
 import asyncio
 import pathway as pw
 from telethon import TelegramClient, events
+from connectors.dedup import SeenStore
+from metrics import CONNECTOR_DUPLICATES, CONNECTOR_EMITTED, CONNECTOR_ERRORS
 
 
 # ========== CHANNEL CONFIGURATION ==========
@@ -53,8 +56,8 @@ class TelegramSource(pw.io.python.ConnectorSubject):
         self.api_hash = api_hash
         self.phone = phone
         self.polling_interval = polling_interval
-        # Track already-seen messages if deduplication is needed
-        self.seen_messages = set()
+        # Track already-seen messages: history backfill overlaps live events and restarts
+        self.seen_messages = SeenStore("telegram", capacity=20_000)
 
     def run(self):
         """
@@ -105,6 +108,7 @@ class TelegramSource(pw.io.python.ConnectorSubject):
                         if message and message.text:
                             await self._process_message(message, "HISTORY")
                 except Exception as e:
+                    CONNECTOR_ERRORS.labels(connector="Telegram").inc()
                     print(f"⚠️ [Telegram] Error reading {channel}: {e}")
 
             # ========== LIVE STREAMING ==========
@@ -136,18 +140,25 @@ class TelegramSource(pw.io.python.ConnectorSubject):
         # Clean text for console preview (truncate and remove newlines)
         text_clean = str(event.text).replace('\n', ' ')[:60]
         
+        # Deduplication: skip messages already emitted
+        url = f"https://t.me/{username}/{event.id}"
+        if self.seen_messages.check_and_add(url):
+            CONNECTOR_DUPLICATES.labels(connector="Telegram").inc()
+            return
+
         # ========== NORMALIZE TO UNIFIED SCHEMA ==========
         # Build structured record for Pathway
         row = {
             "source": "Telegram",
             "text": str(event.text),
-            "url": f"https://t.me/{username}/{event.id}",
+            "url": url,
             "timestamp": float(event.date.timestamp()),
             "bias": tags.get(username, "Unknown")  # Look up bias tag by channel
         }
         
         # Emit row into Pathway dataflow
         self.next(**row)
+        CONNECTOR_EMITTED.labels(connector="Telegram").inc()
         
         # ========== LOGGING ==========
         # Lightweight logging for observability
@@ -1,21 +1,20 @@
 """Data Registry: Multi-Source Intelligence Collection Pipeline
 
 Orchestrates all data sources into unified Pathway event stream:
-- News API (GNews) - news articles
-- RSS Feeds - state media (Russia Today, SCMP) & western media (NYTimes, BBC)
-- Reddit - public discussion forums
+- Polled feeds (feeds.toml) - GNews, RSS (Russia Today, SCMP, NYTimes, BBC),
+  Reddit - all on one asyncio connector runtime
 - Telegram - real-time messaging channels
 - Simulation - test data from JSONL file
 
-All sources normalized into unified InputSchema for downstream processing.
+All sources normalized into unified InputSchema for downstream processing,
+then passed through a near-duplicate stage that tags syndicated copies.
 """
 
 import pathway as pw
 from connectors.telegram_src import TelegramSource
-from connectors.reddit_src import RedditSource
-from connectors.news_src import NewsSource
 from connectors.sim_src import SimulationSource
-from connectors.rss_src import RssSource
+from connectors.runtime import FeedRuntime, load_feeds
+from near_dup import NearDuplicateFilter
 import os
 from dotenv import load_dotenv
 
@@ -29,6 +28,12 @@ TELEGRAM_API_HASH = os.getenv("TELEGRAM_API_HASH")
 TELEGRAM_PHONE = os.getenv("TELEGRAM_PHONE")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
+# Polled feed definitions (URL, source, bias tag, interval) for the connector runtime
+FEEDS_PATH = os.getenv("FLASHPOINT_FEEDS", "feeds.toml")
+
+# Simulation corpus, resolved from this file so any working directory works
+SIM_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "dummy.jsonl")
+
 
 # ========== UNIFIED INPUT SCHEMA ==========
 # All data sources normalized to this schema for downstream processing
@@ -48,6 +53,26 @@ class InputSchema(pw.Schema):
     timestamp: float
     bias: str
 
+def deduplicate(stream, max_items=10_000, threshold=0.7):
+    """Tag near-duplicate events with a reference to the first copy seen
+    
+    Adds a ``duplicate_of`` column: "" for originals, otherwise the URL of
+    the original event. Nothing is dropped here; downstream stages decide
+    (the RAG index skips duplicates, the dashboard collapses them).
+    
+    Args:
+        stream: Pathway table in InputSchema format
+        max_items (int): Originals remembered by the filter (memory bound)
+        threshold (float): Estimated Jaccard similarity counted as duplicate
+    
+    Returns:
+        Pathway table: Input columns plus ``duplicate_of`` (str)
+    """
+    near_dups = NearDuplicateFilter(max_items=max_items, threshold=threshold)
+    return stream.with_columns(
+        duplicate_of=pw.apply_with_type(near_dups.check, str, pw.this.text, pw.this.url)
+    )
+
 def get_data_stream():
     """Build unified multi-source intelligence stream
     
@@ -55,62 +80,29 @@ def get_data_stream():
     1. Initialize individual source connectors
     2. Normalize each to InputSchema
     3. Concatenate into single Pathway table
-    4. Return combined stream for RAG pipeline
+    4. Tag near-duplicates (duplicate_of column)
+    5. Return combined stream for RAG pipeline
     
     Sources:
-    - News API: Global news (60-sec polling interval)
-    - RSS Feeds: State media & Western media (300-sec polling)
-    - Reddit: Public forums (60-sec polling)
+    - Polled feeds: every entry of feeds.toml (GNews, RSS, Reddit), polled
+      concurrently by one asyncio runtime with pooled connections
     - Telegram: Real-time channels (streaming mode)
     
     Returns:
-        Pathway table: Unified event stream [source, text, url, timestamp, bias]
+        Pathway table: Unified event stream [source, text, url, timestamp, bias, duplicate_of]
     """
     
-    # ========== SOURCE 1: NEWS API ==========
-    # GNews aggregator: collects global news articles
-    # Polling: 60 seconds (hourly API limits apply)
-    t_news = pw.io.python.read(
-        NewsSource(NEWS_API_KEY, query="world", polling_interval=60),
-        schema=InputSchema, 
-        name="NewsAPI Source",
-        max_backlog_size=10  # Buffer max 10 items before processing
-    )
-   
-    # ========== SOURCE 2: RSS FEEDS ==========
-    # Russia Today: pro-Russia state media
-    t_rss_russia = pw.io.python.read(
-        RssSource("https://www.rt.com/rss/news/", source="Russia Today", bias_tag="Pro Russia"),
-        schema=InputSchema, 
-        name="RT RSS Feed", 
-        max_backlog_size=10
-    )
-   
-    # South China Morning Post: pro-China business/politics coverage
-    t_rss_china = pw.io.python.read(
-        RssSource("https://www.scmp.com/rss/318199/feed/", source="SCMP", bias_tag="Pro China"),
-        schema=InputSchema, 
-        name="SCMP RSS Feed", 
-        max_backlog_size=10
-    )
-
-    # New York Times: Western/US-aligned coverage
-    t_rss_us = pw.io.python.read(
-        RssSource("https://rss.nytimes.com/services/xml/rss/nyt/World.xml", source="NYTimes", bias_tag="US/Western"),
-        schema=InputSchema, 
-        name="NYTimes RSS Feed",
-        max_backlog_size=10
-    )
-
-    # BBC: UK/Western coverage
-    t_rss_uk = pw.io.python.read(
-        RssSource("https://feeds.bbci.co.uk/news/world/rss.xml", source="BBC", bias_tag="UK/Western"),
-        schema=InputSchema, 
-        name="BBC RSS Feed",
-        max_backlog_size=10
+    # ========== SOURCE 1: POLLED FEEDS ==========
+    # One thread and one keep-alive connection pool for all feeds
+    # Per-host connection limit and jittered polling (see connectors/runtime.py)
+    t_feeds = pw.io.python.read(
+        FeedRuntime(load_feeds(FEEDS_PATH)),
+        schema=InputSchema,
+        name="Feed Runtime",
+        max_backlog_size=100  # Many feeds share this connector
     )
     
-    # ========== SOURCE 3: TELEGRAM ==========
+    # ========== SOURCE 2: TELEGRAM ==========
     # Real-time messaging from curated channels
     # Streaming mode: receives messages as they arrive (no polling)
     t_telegram = pw.io.python.read(
@@ -121,26 +113,11 @@ def get_data_stream():
         max_backlog_size=10
     )
     
-    # ========== SOURCE 4: REDDIT ==========
-    # Public forum discussions across relevant subreddits
-    # Streaming mode: monitors new posts
-    t_reddit = pw.io.python.read(
-        RedditSource(),
-        schema=InputSchema,
-        mode="streaming",
-        name="Reddit Source", 
-        max_backlog_size=10
-    )
-
-    # ========== MERGE RSS FEEDS ==========
-    # Combine all RSS sources into single table
-    t_rss_combined = t_rss_russia.concat_reindex(t_rss_china, t_rss_us, t_rss_uk)    
-    
     # ========== FINAL MERGE: ALL SOURCES ==========
-    # Combine News, Reddit, RSS, and Telegram into unified stream
-    combined_stream = t_news.concat_reindex(t_reddit, t_rss_combined, t_telegram)
+    # Combine polled feeds and Telegram into unified stream
+    combined_stream = t_feeds.concat_reindex(t_telegram)
  
-    return combined_stream
+    return deduplicate(combined_stream)
 
 def get_simulation_stream():
     """Load test data stream from JSONL file for development/testing
@@ -150,20 +127,35 @@ def get_simulation_stream():
     - Replay scenarios for debugging
     - Load-test infrastructure
     
+    Load-generator events are variants of a few templates: the near-duplicate
+    stage would collapse most of them, so it is skipped in that mode unless
+    FLASHPOINT_SIM_NEAR_DUP=1 (every event is then an original).
+    
     Returns:
-        Pathway table: Simulation events in InputSchema format
+        Pathway table: Simulation events in InputSchema format plus duplicate_of
     """
-    sim_path = "data/dummy.jsonl"
+    # Load-generator mode when FLASHPOINT_SIM_RATE (events/s) is set
+    rate = float(os.getenv("FLASHPOINT_SIM_RATE", "0"))
+    near_dup = rate <= 0 or os.getenv("FLASHPOINT_SIM_NEAR_DUP", "0") == "1"
     
-    # Initialize simulation source with 10-second inter-event delay
+    # Initialize simulation source (replay: 10-second inter-event delay)
     t_sim = pw.io.python.read(
-        SimulationSource(file_path=sim_path, interval=10),
+        SimulationSource(
+            file_path=SIM_PATH,
+            interval=10,
+            rate=rate,
+            arrival=os.getenv("FLASHPOINT_SIM_ARRIVAL", "constant"),
+            burst_size=int(os.getenv("FLASHPOINT_SIM_BURST", "1")),
+        ),
         schema=InputSchema,
         autocommit_duration_ms=1000,  # Process batches every 1 second
         name="Simulation Source",
-        max_backlog_size=10
+        # Load mode commits its own batches; a small backlog would throttle the target rate
+        max_backlog_size=None if rate > 0 else 10
     )
 
-    pw.io.csv
-    return t_sim
+    # Replays of the file are tagged as duplicates of the first pass
+    if near_dup:
+        return deduplicate(t_sim)
+    return t_sim.with_columns(duplicate_of="")
 
@@ -0,0 +1,241 @@
+"""Persistent Embedding Cache for the FlashPoint RAG Pipeline
+
+The same text gets embedded over and over: the simulation replays its file
+forever, wire stories arrive through GNews and several RSS feeds, and
+restarts re-ingest everything. This cache sits in front of the sentence
+embedder so duplicates and restarts skip the model entirely.
+
+Storage (one directory per cache):
+- vectors.f32: memory-mapped float32 matrix, one row per slot
+- keys.bin:    memory-mapped 16-byte content hash per slot
+- ticks.u64:   memory-mapped last-use counter per slot (LRU order survives restarts)
+- meta.json:   model name, dimension and capacity (mismatch -> cache reset)
+
+Features:
+- Key: BLAKE2b(model name + whitespace-normalized text)
+- Bounded: least recently used slot is overwritten when full
+- Hit/miss counters for monitoring (also exported to Prometheus)
+- Lazy model loading: with a known dimension, the pipeline is built (and
+  cached texts are served) before the sentence-transformer is loaded
+- Documents only: ``embed_query`` embeds chat questions without touching the
+  cache or the ingest metrics (the query server keeps its own small LRU)
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from pathway.xpacks.llm.embedders import SentenceTransformerEmbedder
+
+from metrics import EMBED_SECONDS, EMBED_TEXTS
+
+KEY_SIZE = 16
+
+
+def cache_key(model, text):
+    """Content hash of the normalized text for a given model"""
+    normalized = " ".join(text.split())
+    return hashlib.blake2b(f"{model}\0{normalized}".encode("utf-8"), digest_size=KEY_SIZE).digest()
+
+
+class EmbeddingCache:
+    """Bounded LRU cache of embedding vectors backed by memory-mapped files
+
+    Attributes:
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups that needed the model
+    """
+
+    def __init__(self, path, model, dim, capacity=100_000, flush_every=1000):
+        self.path = path
+        self.model = model
+        self.dim = dim
+        self.capacity = capacity
+        self.flush_every = flush_every
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(path, exist_ok=True)
+        meta = {"model": model, "dim": dim, "capacity": capacity}
+        meta_path = os.path.join(path, "meta.json")
+        files = [os.path.join(path, name) for name in ("vectors.f32", "keys.bin", "ticks.u64")]
+        fresh = True
+        if os.path.exists(meta_path) and all(os.path.exists(f) for f in files):
+            with open(meta_path) as f:
+                fresh = json.load(f) != meta
+        mode = "w+" if fresh else "r+"
+
+        self.vectors = np.memmap(files[0], dtype=np.float32, mode=mode, shape=(capacity, dim))
+        self.keys = np.memmap(files[1], dtype=np.uint8, mode=mode, shape=(capacity, KEY_SIZE))
+        self.ticks = np.memmap(files[2], dtype=np.uint64, mode=mode, shape=(capacity,))
+        if fresh:
+            with open(meta_path, "w") as f:
+                json.dump(meta, f)
+
+        # Rebuild LRU order from persisted ticks (tick 0 = empty slot)
+        used = np.flatnonzero(self.ticks)
+        used = used[np.argsort(self.ticks[used])]
+        self._slots = OrderedDict((bytes(self.keys[slot]), int(slot)) for slot in used)
+        self._free = [int(s) for s in np.flatnonzero(self.ticks == 0)[::-1]]
+        self._tick = int(self.ticks.max()) if len(used) else 0
+
+        print(f"💾 [EmbedCache] {len(self._slots)}/{capacity} vectors loaded from {path}")
+        atexit.register(self.flush)
+
+    def _touch(self, slot):
+        self._tick += 1
+        self.ticks[slot] = self._tick
+
+    def get_many(self, texts):
+        """Look up texts; returns a list with a vector or None per text"""
+        results = []
+        with self._lock:
+            for text in texts:
+                key = cache_key(self.model, text)
+                slot = self._slots.get(key)
+                if slot is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self.hits += 1
+                    self._slots.move_to_end(key)
+                    self._touch(slot)
+                    results.append(np.array(self.vectors[slot]))
+        return results
+
+    def put(self, text, vector):
+        """Store a vector, evicting the least recently used entry if full"""
+        key = cache_key(self.model, text)
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                if self._free:
+                    slot = self._free.pop()
+                else:
+                    _, slot = self._slots.popitem(last=False)
+                self._slots[key] = slot
+            else:
+                self._slots.move_to_end(key)
+            self.vectors[slot] = vector
+            self.keys[slot] = np.frombuffer(key, dtype=np.uint8)
+            self._touch(slot)
+
+            self._puts += 1
+            if self._puts % self.flush_every == 0:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        self.vectors.flush()
+        self.keys.flush()
+        self.ticks.flush()
+        print(f"💾 [EmbedCache] {self.stats()}")
+
+    def flush(self):
+        """Write dirty pages to disk (pages also persist if the process dies)"""
+        with self._lock:
+            self._flush_locked()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "size": len(self._slots),
+            "capacity": self.capacity,
+        }
+
+
+class EmbeddingCacheMixin:
+    """Embedder mixin: consult ``self.cache`` (an EmbeddingCache) before the model
+
+    Mixed in before a Pathway embedder class, whose ``__wrapped__`` is the
+    model call. Only cache misses (deduplicated within a batch) reach it.
+    """
+
+    def embed_uncached(self, texts):
+        """Model call for ``texts``, bypassing the cache (timed for metrics)"""
+        started = time.perf_counter()
+        vectors = super().__wrapped__(texts)
+        EMBED_SECONDS.observe(time.perf_counter() - started)
+        EMBED_TEXTS.labels(result="embedded").inc(len(texts))
+        return vectors
+
+    def embed_query(self, text):
+        """Model call for one query text, bypassing the cache and the ingest metrics
+
+        Free-text questions would otherwise evict document vectors from the
+        bounded cache and count as ingested embeddings.
+        """
+        return super().__wrapped__([text])[0]
+
+    def __wrapped__(self, input: list[str], **kwargs) -> list[np.ndarray]:
+        # Call-time encode options change the vectors: bypass the cache
+        if kwargs:
+            return super().__wrapped__(input, **kwargs)
+
+        single = isinstance(input, str)
+        texts = [input] if single else list(input)
+        vectors = self.cache.get_many(texts)
+
+        missing = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(texts[i], []).append(i)
+        EMBED_TEXTS.labels(result="cached").inc(len(texts) - len(missing))
+        if missing:
+            unique = list(missing)
+            for text, vector in zip(unique, self.embed_uncached(unique)):
+                self.cache.put(text, vector)
+                for i in missing[text]:
+                    vectors[i] = vector
+
+        return vectors[0] if single else vectors
+
+
+class CachedSentenceTransformerEmbedder(EmbeddingCacheMixin, SentenceTransformerEmbedder):
+    """SentenceTransformerEmbedder that consults an EmbeddingCache first
+
+    Only cache misses (deduplicated within a batch) reach the model. The
+    model is loaded on first use (or by ``load_model``, e.g. from a warm-up
+    thread) when ``dimension`` is given.
+    """
+
+    def __init__(self, model, cache_dir, cache_size=100_000, dimension=None, call_kwargs={}, device="cpu",
+                 batch_size=1024, **sentencetransformer_kwargs):
+        # Skip SentenceTransformerEmbedder.__init__: it loads the model eagerly
+        super(SentenceTransformerEmbedder, self).__init__(max_batch_size=batch_size)
+        self.kwargs = {"batch_size": batch_size, **call_kwargs}
+        self.model_name = model
+        self._model = None
+        self._model_args = {"device": device, **sentencetransformer_kwargs}
+        self._model_lock = threading.Lock()
+        if dimension is None:
+            dimension = self.model.get_sentence_embedding_dimension()
+        self.cache = EmbeddingCache(cache_dir, model, dimension, capacity=cache_size)
+
+    @property
+    def model(self):
+        """The sentence-transformer, loaded on first access"""
+        if self._model is None:
+            self.load_model()
+        return self._model
+
+    def load_model(self):
+        with self._model_lock:
+            if self._model is None:
+                from sentence_transformers import SentenceTransformer
+
+                self._model = SentenceTransformer(model_name_or_path=self.model_name, **self._model_args)
+        return self._model
+
+    def get_embedding_dimension(self, **kwargs):
+        # Known from the cache: no model call while the index is being built
+        return self.cache.dim if not kwargs else super().get_embedding_dimension(**kwargs)
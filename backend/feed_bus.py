@@ -0,0 +1,83 @@
+"""Live Feed Fan-Out for FlashPoint API
+
+Pushes every event accepted by the receiver to all connected dashboards
+over Server-Sent Events, so delivery latency is event-driven and the
+request rate no longer grows with the number of viewers.
+
+Features:
+- One bounded asyncio queue per subscriber (slow clients never block ingest)
+- Drop/resync policy: an overflowing subscriber loses its queued events and
+  is told to catch up through the cursor-based feed endpoint
+- SSE wire formatting with event ids (= feed sequence numbers)
+"""
+
+import asyncio
+import json
+
+# Per-client queue bound; a dashboard further behind than this must resync
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Marker placed in an overflowing subscriber's queue
+RESYNC = object()
+
+
+class Subscription:
+    """Single client's view of the broadcast: a bounded queue plus resync state"""
+
+    def __init__(self, queue_size):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.dropped = 0  # Events discarded for this client due to overflow
+
+    def offer(self, event):
+        """Enqueue without blocking; on overflow switch the client to resync mode"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drain everything: the client will refetch from its cursor anyway
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.dropped += 1
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self, timeout):
+        """Wait for the next event; returns None on timeout (used for keep-alives)"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class FeedBroadcaster:
+    """Fans out feed events to all live subscribers
+
+    All methods must be called from the API event loop thread.
+    """
+
+    def __init__(self, queue_size=SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscribers = set()
+
+    def subscribe(self):
+        sub = Subscription(self.queue_size)
+        self.subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        self.subscribers.discard(sub)
+
+    def publish(self, event):
+        """Deliver an event to every subscriber (O(subscribers), never blocks)"""
+        for sub in self.subscribers:
+            sub.offer(event)
+
+
+def format_sse(data, event=None, event_id=None):
+    """Encode one Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event is not None:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
@@ -0,0 +1,88 @@
+"""Feed Buffer Snapshot for Warm API Restarts
+
+The API keeps the latest events in memory only, so a restart leaves the
+dashboard empty until new events trickle in from the pipeline (which does
+not resend what it already delivered). This snapshot keeps the buffer and
+its sequence cursor on disk.
+
+Features:
+- JSON file with the buffered events, the last sequence number and the
+  feed epoch
+- Atomic writes (temp file + rename), skipped when nothing changed
+- Restored sequence numbers continue where they stopped, so dashboard
+  cursors stay valid across restarts
+- The epoch is restored only from a snapshot written at clean shutdown: after
+  a crash, sequence numbers newer than the last periodic snapshot may have
+  been handed out, so clients must be told to start over (new epoch)
+"""
+
+import json
+import os
+
+# Seconds between periodic snapshots
+SNAPSHOT_INTERVAL = 10
+
+
+class FeedSnapshot:
+    """On-disk copy of the API feed buffer
+
+    Attributes:
+        path (str): Snapshot file (None disables snapshots)
+        saved_seq (int): Sequence number of the last snapshot written
+        saved_final (bool): Whether the file on disk was written at shutdown
+    """
+
+    def __init__(self, path):
+        self.path = path or None
+        self.saved_seq = None
+        self.saved_final = False
+
+    def load(self):
+        """Read the snapshot
+
+        A clean (shutdown) snapshot is rewritten as not clean right away, so a
+        crash of this process cannot hand its epoch to the next one.
+
+        Returns:
+            tuple: (events oldest first, last sequence number, epoch or None);
+            empty when missing. The epoch is None unless written at shutdown.
+        """
+        if not self.path or not os.path.exists(self.path):
+            return [], 0, None
+        try:
+            with open(self.path) as f:
+                snapshot = json.load(f)
+            events, last_seq = snapshot["events"], int(snapshot["last_seq"])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ [Snapshot] Unreadable feed snapshot ({e}), starting empty")
+            return [], 0, None
+        epoch = snapshot.get("epoch") if snapshot.get("final") else None
+        if epoch:
+            self._write(events, last_seq, epoch, final=False)
+        self.saved_seq = last_seq
+        print(f"💾 [Snapshot] Restored {len(events)} events (seq {last_seq}) from {self.path}")
+        return events, last_seq, epoch
+
+    def save(self, events, last_seq, epoch, final=False):
+        """Write the buffer if new events arrived since the last snapshot
+
+        Must be called on the thread that mutates the buffer (the event loop).
+
+        Args:
+            events (list): Buffered events, oldest first
+            last_seq (int): Sequence number of the last feed change
+            epoch (str): Feed epoch the sequence numbers belong to
+            final (bool): Written at shutdown (the next process may keep the epoch)
+        """
+        if not self.path or (last_seq == self.saved_seq and final == self.saved_final):
+            return
+        self._write(events, last_seq, epoch, final)
+
+    def _write(self, events, last_seq, epoch, final):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"last_seq": last_seq, "epoch": epoch, "final": final, "events": events}, f)
+        os.replace(tmp_path, self.path)
+        self.saved_seq = last_seq
+        self.saved_final = final
@@ -0,0 +1,311 @@
+"""Gazetteer Engine: One-Pass Place Name Matching for FlashPoint
+
+Finds place mentions in event text with a compiled Aho-Corasick automaton,
+so matching cost depends on the text length only, not on how many places
+the gazetteer knows.
+
+The gazetteer (places + automaton) is stored in a compact precomputed binary
+that is memory-mapped at startup: nothing is parsed or rebuilt on boot and
+the pages are shared between worker processes. Build it from GeoNames dumps
+with ``tools/build_gazetteer.py``; without a file, a small built-in seed
+gazetteer is compiled in memory.
+
+Features:
+- Single pass over the text, word-boundary aware
+- Case-insensitive automaton, but a mention must start with a capital letter
+  (place names are proper nouns; this keeps "nice" or "split" from matching)
+- Names and aliases map to candidate places ranked by population
+- Ambiguity resolution: most specific level (city > region > country),
+  then longest name, then most populous
+"""
+
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_left
+from collections import deque
+
+# ========== BINARY FORMAT ==========
+# Header: magic, version, then section sizes. All arrays are little-endian
+# uint32/float32 laid out back to back (see Gazetteer.__init__ for order).
+MAGIC = b"FPGZ"
+VERSION = 1
+HEADER = struct.Struct("<4s7I")
+NONE = 0xFFFFFFFF
+
+# Place specificity levels (higher = more specific)
+LEVEL_COUNTRY = 0
+LEVEL_REGION = 1
+LEVEL_DISTRICT = 2
+LEVEL_CITY = 3
+
+# ========== SEED GAZETTEER ==========
+# Used when no compiled gazetteer file is available.
+# (name, aliases, lat, lon, population, level)
+SEED_PLACES = [
+    ("Kyiv", ["Kiev"], 50.4501, 30.5234, 2963199, LEVEL_CITY),
+    ("Ukraine", [], 48.3794, 31.1656, 41000000, LEVEL_COUNTRY),
+    ("Moscow", [], 55.7558, 37.6173, 12500000, LEVEL_CITY),
+    ("Russia", [], 61.5240, 105.3188, 144000000, LEVEL_COUNTRY),
+    ("Washington", [], 38.9072, -77.0369, 689545, LEVEL_CITY),
+    ("USA", ["United States"], 37.0902, -95.7129, 331000000, LEVEL_COUNTRY),
+    ("Beijing", [], 39.9042, 116.4074, 21540000, LEVEL_CITY),
+    ("China", [], 35.8617, 104.1954, 1412000000, LEVEL_COUNTRY),
+    ("Gaza", [], 31.5, 34.466, 590481, LEVEL_CITY),
+    ("Israel", [], 31.0461, 34.8516, 9700000, LEVEL_COUNTRY),
+    ("Taiwan", [], 23.6978, 120.9605, 23570000, LEVEL_COUNTRY),
+    ("London", [], 51.5074, -0.1278, 8982000, LEVEL_CITY),
+    ("Tehran", [], 35.6892, 51.3890, 8694000, LEVEL_CITY),
+    ("Iran", [], 32.4279, 53.6880, 88550000, LEVEL_COUNTRY),
+    ("Delhi", ["New Delhi"], 28.6139, 77.2090, 16787941, LEVEL_CITY),
+    ("India", [], 20.5937, 78.9629, 1417000000, LEVEL_COUNTRY),
+]
+
+
+def normalize(name):
+    """Normalize a name or text for matching (lowercase, collapsed spaces)"""
+    return " ".join(name.lower().split())
+
+
+# ========== COMPILER ==========
+def compile_gazetteer(places):
+    """Compile places into the binary gazetteer format
+
+    Args:
+        places: Iterable of (name, aliases, lat, lon, population, level)
+
+    Returns:
+        bytes: Serialized gazetteer, loadable with ``Gazetteer(buffer)``
+    """
+    names = []
+    lats, lons, pops, levels = [], [], [], []
+    pattern_ids = {}  # normalized pattern -> pattern id
+    pattern_cands = []  # pattern id -> [place ids]
+
+    for name, aliases, lat, lon, population, level in places:
+        place_id = len(names)
+        names.append(name)
+        lats.append(lat)
+        lons.append(lon)
+        pops.append(int(population or 0))
+        levels.append(level)
+        for alias in {normalize(n) for n in [name, *aliases]}:
+            if not alias:
+                continue
+            pid = pattern_ids.setdefault(alias, len(pattern_ids))
+            if pid == len(pattern_cands):
+                pattern_cands.append([])
+            pattern_cands[pid].append(place_id)
+
+    # Candidates best-first: most populous, then most specific
+    for cands in pattern_cands:
+        cands.sort(key=lambda p: (-pops[p], -levels[p]))
+
+    # ----- Trie -----
+    goto = [{}]
+    depth = [0]
+    term = [NONE]
+    for pattern, pid in pattern_ids.items():
+        state = 0
+        for ch in pattern:
+            nxt = goto[state].get(ch)
+            if nxt is None:
+                nxt = len(goto)
+                goto[state][ch] = nxt
+                goto.append({})
+                depth.append(depth[state] + 1)
+                term.append(NONE)
+            state = nxt
+        term[state] = pid
+
+    # ----- Failure and dictionary-suffix links (BFS) -----
+    n_states = len(goto)
+    fail = [0] * n_states
+    dict_link = [NONE] * n_states
+    queue = deque(goto[0].values())
+    while queue:
+        state = queue.popleft()
+        for ch, nxt in goto[state].items():
+            f = fail[state]
+            while f and ch not in goto[f]:
+                f = fail[f]
+            fail[nxt] = goto[f].get(ch, 0) if goto[f].get(ch) != nxt else 0
+            link = fail[nxt]
+            dict_link[nxt] = link if term[link] != NONE else dict_link[link]
+            queue.append(nxt)
+
+    # ----- Flatten -----
+    edge_start, edge_char, edge_target = [0], [], []
+    for edges in goto:
+        for ch in sorted(edges):
+            edge_char.append(ord(ch))
+            edge_target.append(edges[ch])
+        edge_start.append(len(edge_char))
+
+    name_bytes = [n.encode("utf-8") for n in names]
+    name_off = [0]
+    for b in name_bytes:
+        name_off.append(name_off[-1] + len(b))
+    blob = b"".join(name_bytes)
+    blob += b"\0" * (-len(blob) % 4)
+
+    cand_start, cands = [0], []
+    for c in pattern_cands:
+        cands.extend(c)
+        cand_start.append(len(cands))
+
+    def u32(values):
+        return struct.pack(f"<{len(values)}I", *values)
+
+    return b"".join([
+        HEADER.pack(MAGIC, VERSION, len(names), n_states, len(edge_char), len(pattern_cands), len(cands), len(blob)),
+        struct.pack(f"<{len(lats)}f", *lats),
+        struct.pack(f"<{len(lons)}f", *lons),
+        u32(pops), u32(levels), u32(name_off), blob,
+        u32(edge_start), u32(edge_char), u32(edge_target),
+        u32(fail), u32(depth), u32(term), u32(dict_link),
+        u32(cand_start), u32(cands),
+    ])
+
+
+# ========== RUNTIME ==========
+class Gazetteer:
+    """Read-only matcher over a compiled gazetteer buffer (bytes or mmap)"""
+
+    def __init__(self, buffer):
+        if sys.byteorder != "little":
+            raise RuntimeError("Gazetteer binaries are little-endian only")
+        magic, version, n_places, n_states, n_edges, n_patterns, n_cands, names_len = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a FlashPoint gazetteer file (bad magic/version)")
+
+        self._buffer = buffer  # Keep the mapping alive
+        view = memoryview(buffer)
+        offset = HEADER.size
+
+        def take(count, fmt="I", itemsize=4):
+            nonlocal offset
+            section = view[offset:offset + count * itemsize].cast(fmt)
+            offset += count * itemsize
+            return section
+
+        self.lat = take(n_places, "f")
+        self.lon = take(n_places, "f")
+        self.population = take(n_places)
+        self.level = take(n_places)
+        self.name_off = take(n_places + 1)
+        self.names = take(names_len, "B", 1)
+        self.edge_start = take(n_states + 1)
+        self.edge_char = take(n_edges)
+        self.edge_target = take(n_edges)
+        self.fail = take(n_states)
+        self.depth = take(n_states)
+        self.term = take(n_states)
+        self.dict_link = take(n_states)
+        self.cand_start = take(n_patterns + 1)
+        self.cands = take(n_cands)
+        self.n_places = n_places
+
+    @classmethod
+    def load(cls, path):
+        """Memory-map a compiled gazetteer file"""
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped)
+
+    @classmethod
+    def from_places(cls, places):
+        """Compile places in memory (small gazetteers / tests)"""
+        return cls(compile_gazetteer(places))
+
+    def place_name(self, place_id):
+        return bytes(self.names[self.name_off[place_id]:self.name_off[place_id + 1]]).decode("utf-8")
+
+    def find(self, text):
+        """Find all word-bounded place mentions in one pass
+
+        Args:
+            text (str): Event text
+
+        Returns:
+            list: (start, end, pattern_id) tuples in text order
+        """
+        lowered = text.lower()
+        # Capital-initial check needs 1:1 positions (lower() can expand e.g. "İ")
+        check_case = len(lowered) == len(text)
+        edge_start, edge_char, edge_target = self.edge_start, self.edge_char, self.edge_target
+        fail, term, dict_link, depth = self.fail, self.term, self.dict_link, self.depth
+
+        matches = []
+        state = 0
+        for i, ch in enumerate(lowered):
+            c = ord(ch)
+            # Follow failure links until a transition on c exists (or root)
+            while True:
+                lo, hi = edge_start[state], edge_start[state + 1]
+                j = bisect_left(edge_char, c, lo, hi)
+                if j < hi and edge_char[j] == c:
+                    state = edge_target[j]
+                    break
+                if state == 0:
+                    break
+                state = fail[state]
+
+            out = state if term[state] != NONE else dict_link[state]
+            while out != NONE:
+                end = i + 1
+                start = end - depth[out]
+                # Word boundaries: no letter/digit glued to either side
+                if (
+                    (start == 0 or not lowered[start - 1].isalnum())
+                    and (end == len(lowered) or not lowered[end].isalnum())
+                    and (not check_case or text[start].isupper())
+                ):
+                    matches.append((start, end, term[out]))
+                out = dict_link[out]
+        return matches
+
+    def resolve(self, text):
+        """Pick the single best place mentioned in the text
+
+        Strategy: most specific level, then longest mention, then most
+        populous candidate. Each name resolves to its most populous place.
+
+        Returns:
+            int or None: Place id of the best match
+        """
+        best, best_key = None, None
+        for start, end, pattern in self.find(text):
+            place = self.cands[self.cand_start[pattern]]
+            key = (self.level[place], end - start, self.population[place])
+            if best_key is None or key > best_key:
+                best, best_key = place, key
+        return best
+
+    def locate(self, text):
+        """Resolve text to coordinates
+
+        Returns:
+            dict or None: {"lat", "lon", "place"} of the best match
+        """
+        if not text:
+            return None
+        place = self.resolve(text)
+        if place is None:
+            return None
+        return {
+            "lat": round(self.lat[place], 4),
+            "lon": round(self.lon[place], 4),
+            "place": self.place_name(place),
+        }
+
+
+def load_gazetteer(path=None):
+    """Memory-map the compiled gazetteer at ``path``, or fall back to the seed set"""
+    if path and os.path.exists(path):
+        gazetteer = Gazetteer.load(path)
+        print(f"🗺️ [Geo] Loaded gazetteer with {gazetteer.n_places} places from {path}")
+        return gazetteer
+    print("🗺️ [Geo] No compiled gazetteer found, using built-in seed places")
+    return Gazetteer.from_places(SEED_PLACES)
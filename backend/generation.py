@@ -0,0 +1,255 @@
+"""Generation Scheduler for Local LLM Inference
+
+TinyLlama on CPU takes seconds per answer. Without a scheduler every query
+starts its own generation the moment it arrives, so a burst of questions
+pushes all of them into multi-minute latency. This scheduler puts one
+worker in front of the model:
+
+Features:
+- Dynamic batching: prompts arriving within ``batch_window`` seconds are
+  generated together, up to ``max_batch_size`` per model call
+- Admission control: bounded queue; ``submit`` raises QueueFull with a
+  Retry-After estimate instead of accepting work it cannot finish in time
+- Per-request deadlines: requests still queued at their deadline (or whose
+  client gave up) are dropped before they reach the model
+- Token streaming: streaming requests run alone (no batch) and push text
+  chunks to a callback as the model produces them
+- Metrics: queue depth, in-flight batch size, wait-time percentiles,
+  rejected / expired / completed counters
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from metrics import GENERATION_SECONDS
+
+# Wait-time samples kept for percentiles
+WAIT_SAMPLES = 1000
+
+
+class QueueFull(Exception):
+    """Generation queue is at capacity
+
+    Attributes:
+        retry_after (int): Suggested seconds before retrying
+    """
+
+    def __init__(self, retry_after):
+        super().__init__(f"Generation queue full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(Exception):
+    """Request deadline passed before generation started"""
+
+
+class GenerationCancelled(Exception):
+    """Raised from a token callback to abort a streaming generation"""
+
+
+class _Request:
+    __slots__ = ("prompt", "on_token", "future", "enqueued", "deadline")
+
+    def __init__(self, prompt, timeout, on_token=None):
+        self.prompt = prompt
+        self.on_token = on_token
+        self.future = Future()
+        self.enqueued = time.monotonic()
+        self.deadline = self.enqueued + timeout
+
+
+class GenerationScheduler:
+    """Single-worker batching queue in front of a batch generation function
+
+    Attributes:
+        generate_batch (callable): list[str] prompts -> list[str] answers
+        generate_stream (callable): (prompt, on_token) -> answer, calling
+            on_token(text) for each chunk; None disables streaming
+        max_batch_size (int): Prompts per model call
+        batch_window (float): Seconds to wait for a batch to fill
+        max_queue (int): Queued requests before new ones are rejected
+        default_timeout (float): Deadline for requests without their own
+    """
+
+    def __init__(self, generate_batch, generate_stream=None, max_batch_size=4, batch_window=0.05, max_queue=16, default_timeout=120):
+        self.generate_batch = generate_batch
+        self.generate_stream = generate_stream
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.max_queue = max_queue
+        self.default_timeout = default_timeout
+
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.expired = 0
+        self.failed = 0
+        self.batches = 0
+        self.batch_seconds = 5.0  # EWMA of model time per batch (seeded pessimistically)
+        self.waits = deque(maxlen=WAIT_SAMPLES)
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="flashpoint-generation", daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self):
+        return len(self._queue)
+
+    def retry_after(self):
+        """Estimated seconds until the current backlog has been generated"""
+        batches_ahead = math.ceil((len(self._queue) + self.in_flight + 1) / self.max_batch_size)
+        return max(1, math.ceil(batches_ahead * self.batch_seconds))
+
+    def submit(self, prompt, timeout=None, on_token=None):
+        """Queue a prompt for generation
+
+        Args:
+            prompt (str): Fully built prompt
+            timeout (float): Seconds until the request is dropped if not started
+            on_token (callable): Stream the answer: called with each text chunk
+                from the worker thread (may raise GenerationCancelled)
+
+        Returns:
+            Future: Resolves to the answer, or raises DeadlineExceeded
+
+        Raises:
+            QueueFull: The queue is at capacity
+        """
+        if on_token is not None and self.generate_stream is None:
+            raise ValueError("Scheduler has no streaming generator")
+        request = _Request(prompt, timeout if timeout is not None else self.default_timeout, on_token)
+        with self._cond:
+            if len(self._queue) >= self.max_queue:
+                self.rejected += 1
+                raise QueueFull(self.retry_after())
+            self._queue.append(request)
+            self._cond.notify()
+        return request.future
+
+    def _collect(self):
+        """Block for the first request, then fill the batch for up to batch_window"""
+        with self._cond:
+            while not self._queue:
+                self._cond.wait()
+            window_end = time.monotonic() + self.batch_window
+            while len(self._queue) < self.max_batch_size:
+                remaining = window_end - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch = []
+            now = time.monotonic()
+            while self._queue and len(batch) < self.max_batch_size:
+                # Streaming requests run alone: leave one for the next round
+                if batch and self._queue[0].on_token:
+                    break
+                request = self._queue.popleft()
+                if now > request.deadline:
+                    self.expired += 1
+                    request.future.set_exception(DeadlineExceeded("Deadline passed while queued"))
+                elif request.future.set_running_or_notify_cancel():
+                    # Cancelled futures (client disconnected) are skipped
+                    self.waits.append(now - request.enqueued)
+                    batch.append(request)
+                    if request.on_token:
+                        break
+            self.in_flight = len(batch)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                continue
+            started = time.monotonic()
+            try:
+                if batch[0].on_token:
+                    answers = [self.generate_stream(batch[0].prompt, batch[0].on_token)]
+                else:
+                    answers = self.generate_batch([r.prompt for r in batch])
+                    if len(answers) != len(batch):
+                        # Answers can't be matched to prompts: fail the whole batch below
+                        raise RuntimeError(f"Generator returned {len(answers)} answers for {len(batch)} prompts")
+                for request, answer in zip(batch, answers):
+                    request.future.set_result(answer)
+                self.completed += len(batch)
+            except GenerationCancelled as e:
+                batch[0].future.set_exception(e)
+            except Exception as e:
+                print(f"❌ [Generation] Batch of {len(batch)} failed: {e}")
+                self.failed += len(batch)
+                for request in batch:
+                    request.future.set_exception(e)
+            finally:
+                elapsed = time.monotonic() - started
+                GENERATION_SECONDS.labels(mode="stream" if batch[0].on_token else "batch").observe(elapsed)
+                self.batch_seconds = 0.8 * self.batch_seconds + 0.2 * elapsed
+                self.batches += 1
+                self.in_flight = 0
+            print(f"🧠 [Generation] Batch of {len(batch)} in {elapsed:.1f}s (queued: {len(self._queue)})")
+
+    def stats(self):
+        waits = np.array(self.waits) if self.waits else np.zeros(1)
+        return {
+            "queue_depth": len(self._queue),
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "expired": self.expired,
+            "failed": self.failed,
+            "batches": self.batches,
+            "avg_batch_seconds": round(self.batch_seconds, 3),
+            "wait_p50": round(float(np.percentile(waits, 50)), 3),
+            "wait_p95": round(float(np.percentile(waits, 95)), 3),
+        }
+
+
+# ========== HUGGINGFACE PIPELINE GENERATORS ==========
+
+def hf_batch_generator(model):
+    """Batch generation function for an ``llms.HFPipelineChat`` model"""
+    # Batched generation needs a pad token (left padding for decoder-only models)
+    if model.tokenizer.pad_token_id is None:
+        model.tokenizer.pad_token = model.tokenizer.eos_token
+    model.tokenizer.padding_side = "left"
+
+    def generate_batch(prompts):
+        return model.__wrapped__([[{"role": "user", "content": prompt}] for prompt in prompts])
+
+    return generate_batch
+
+
+def hf_stream_generator(model):
+    """Streaming generation function for an ``llms.HFPipelineChat`` model
+
+    Decoded text is pushed to ``on_token`` from inside ``generate`` (word
+    boundaries, as produced by transformers' TextStreamer).
+    """
+    from transformers import TextStreamer
+
+    class CallbackStreamer(TextStreamer):
+        def __init__(self, on_token):
+            super().__init__(model.tokenizer, skip_prompt=True, skip_special_tokens=True)
+            self.on_token = on_token
+
+        def on_finalized_text(self, text, stream_end=False):
+            if text:
+                self.on_token(text)
+
+    call_kwargs = {k: v for k, v in model.kwargs.items() if k != "batch_size"}
+
+    def generate_stream(prompt, on_token):
+        output = model.pipeline(
+            [{"role": "user", "content": prompt}], streamer=CallbackStreamer(on_token), **call_kwargs
+        )
+        return output[0]["generated_text"][-1]["content"]
+
+    return generate_stream
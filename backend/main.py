@@ -3,40 +3,122 @@
 This module orchestrates the core intelligence processing engine:
 - Collects multi-source real-time data (news, Reddit, Telegram, RSS)
 - Builds a RAG pipeline for intelligent document retrieval
-- Processes user queries with context-aware LLM responses
+- Serves retrieval to the chat query server (batched, admission-controlled LLM answers)
+- Narrows retrieval by source, bias and time range inside the index search
+- Keeps a BM25 keyword index next to the vector index (hybrid retrieval, /v1/search)
+- Serves repeated questions from a semantic answer cache
+- Exports Prometheus metrics (query server :8011/metrics, engine :20000/metrics)
+- Persists connector inputs for warm restarts (index rebuilt from the snapshot)
+- Starts serving at once; models load in the background (/healthz, /readyz)
 """
 
+import time
+
+STARTED = time.perf_counter()  # Before heavy imports: startup breakdown baseline
+
+import os
+from functools import lru_cache
+from time import time as wall_clock
 import pathway as pw
 from data_registry import get_data_stream, get_simulation_stream
-from pathway.stdlib.indexing.nearest_neighbors import BruteForceKnnFactory
+from batch_writer import write_batched
+from retrievers import (
+    build_metadata_filter,
+    keyword_query,
+    make_keyword_factory,
+    make_retriever_factory,
+    reciprocal_rank_fusion,
+    retrieval_mode,
+)
+from retention import apply_retention, index_size, retention_seconds
 from pathway.xpacks.llm.document_store import DocumentStore
-from pathway.xpacks.llm.embedders import SentenceTransformerEmbedder
-from pathway.xpacks.llm import llms
+from embedding_cache import CachedSentenceTransformerEmbedder
+from onnx_embedder import CachedOnnxEmbedder
+from answer_cache import SemanticAnswerCache
+from generation import GenerationScheduler, hf_batch_generator, hf_stream_generator
+from query_server import create_query_app, serve_in_background
+from metrics import INDEX_DOCUMENTS, observe_lag
+from startup import Startup
+
+IMPORTED = time.perf_counter()
 
 # Query schema for REST endpoint: receives user search queries
 class QuerySchema(pw.Schema):
-    """Schema for incoming user queries from HTTP endpoint"""
+    """Schema for incoming user queries from HTTP endpoint
+
+    Optional filters narrow the search: comma-separated sources / bias tags
+    and a Unix-timestamp range.
+    """
     messages: str
+    sources: str | None = pw.column_definition(default_value=None)
+    biases: str | None = pw.column_definition(default_value=None)
+    since: float | None = pw.column_definition(default_value=None)
+    until: float | None = pw.column_definition(default_value=None)
+
+
+class KeywordQuerySchema(QuerySchema):
+    """Schema for keyword (BM25) searches: same filters, caller-chosen k"""
+    k: int = pw.column_definition(default_value=10)
+
+
+def persistence_config():
+    """Pathway persistence settings (FLASHPOINT_PERSIST_DIR, empty disables)
+
+    Every named connector's input is snapshotted. On restart the snapshot is
+    replayed through the dataflow (embeddings come from the embedding cache,
+    so the index is rebuilt without the model), then connectors resume; their
+    seen-item stores keep them from re-emitting what was already ingested.
+
+    Returns:
+        pw.persistence.Config or None
+    """
+    path = os.getenv("FLASHPOINT_PERSIST_DIR", os.path.join("..", "data", "pathway_state"))
+    if not path:
+        return None
+    print(f"💾 [Persistence] Pipeline state in {path}")
+    return pw.persistence.Config(
+        backend=pw.persistence.Backend.filesystem(path),
+        snapshot_interval_ms=int(os.getenv("FLASHPOINT_SNAPSHOT_MS", 1000)),
+    )
+
+
+def observe_index_lag(key, row, time, is_addition):
+    """pw.io.subscribe callback: ingest lag of documents entering the index"""
+    if is_addition:
+        observe_lag("index", row["timestamp"], wall_clock())
 
 
 def build_rag_pipeline(combined_stream):
     """Build RAG pipeline with embedding-based document retrieval
     
     Process:
-    1. Transform raw data stream into RAG-compatible format
-    2. Extract 'text' field for semantic embedding
-    3. Preserve metadata (source, URL, timestamp, bias) for context
-    4. Initialize sentence embedder for semantic similarity search
-    5. Create document store with KNN-based retrieval
+    1. Skip near-duplicates (already indexed via their original)
+    2. Retract documents older than the retention window (steady index size)
+    3. Transform raw data stream into RAG-compatible format
+    4. Extract 'text' field for semantic embedding
+    5. Preserve metadata (source, URL, timestamp, bias) for context
+    6. Initialize sentence embedder for semantic similarity search
+    7. Create document store with the configured KNN index (HNSW by default)
+    8. Create a second document store over a BM25 inverted index (keywords)
     
     Args:
-        combined_stream: Pathway table with columns [source, text, url, timestamp, bias]
+        combined_stream: Pathway table with columns [source, text, url, timestamp, bias, duplicate_of]
     
     Returns:
-        DocumentStore: Initialized store for document retrieval queries
+        tuple: (vector DocumentStore, keyword DocumentStore, embedder used for the vector index)
     """
+    # Syndicated copies cost an embedding and an index slot for no new information
+    originals = combined_stream.filter(pw.this.duplicate_of == "")
+
+    # Sliding time window (FLASHPOINT_RETENTION_HOURS): expired rows are
+    # retracted incrementally and removed from the index
+    retained = apply_retention(originals, retention_seconds())
+    index_size.track(retained)
+    INDEX_DOCUMENTS.set_function(lambda: index_size.value)
+    pw.io.subscribe(retained, on_change=observe_index_lag, name="Ingest Lag")
+
     # Transform input stream: rename text field and pack metadata
-    rag_stream = combined_stream.select(
+    rag_stream = retained.select(
         # Extract main content for embedding/retrieval
         data=pw.this.text,
         
@@ -57,14 +139,35 @@ def build_rag_pipeline(combined_stream):
 
     # Initialize semantic embedder: converts text to 384-dim vectors
     # Model: all-MiniLM-L6-v2 (lightweight, 22M params, optimized for inference)
-    embedder = SentenceTransformerEmbedder(
-        model="all-MiniLM-L6-v2")
+    # Fronted by a persistent content-hash cache: duplicates and restarts skip the model
+    # Known dimension: the model itself loads in the background (see run())
+    cache_dir = os.getenv("FLASHPOINT_EMBED_CACHE_DIR", os.path.join("..", "data", "embedding_cache"))
+    cache_size = int(os.getenv("FLASHPOINT_EMBED_CACHE_SIZE", 100_000))
+    dimension = int(os.getenv("FLASHPOINT_EMBED_DIM", 384))
+    if os.getenv("FLASHPOINT_EMBEDDER", "torch").lower() == "onnx":
+        # Same model on ONNX Runtime, int8-quantized: cheaper CPU ingest (onnx_embedder.py)
+        # Own cache directory: its vectors differ slightly from the PyTorch model's
+        embedder = CachedOnnxEmbedder(
+            model="sentence-transformers/all-MiniLM-L6-v2",
+            dimension=dimension,
+            cache_dir=os.path.join(cache_dir, "onnx"),
+            cache_size=cache_size,
+            quantize=os.getenv("FLASHPOINT_ONNX_QUANTIZE", "1") == "1",
+            batch_size=int(os.getenv("FLASHPOINT_EMBED_BATCH", 64)),
+            threads=int(os.getenv("FLASHPOINT_EMBED_THREADS", 0)) or None,
+            max_tokens=int(os.getenv("FLASHPOINT_EMBED_MAX_TOKENS", 256)),
+        )
+    else:
+        embedder = CachedSentenceTransformerEmbedder(
+            model="all-MiniLM-L6-v2",
+            dimension=dimension,
+            cache_dir=cache_dir,
+            cache_size=cache_size,
+        )
     
-    # Configure brute-force KNN retriever for nearest-neighbor search
-    # (Suitable for moderate datasets; scales O(n) per query)
-    retriever_factory = BruteForceKnnFactory(
-        embedder=embedder,
-    )
+    # Configure nearest-neighbor index (see retrievers.py / FLASHPOINT_RETRIEVER)
+    # Default HNSW index is updated incrementally and handles retractions
+    retriever_factory = make_retriever_factory(embedder)
 
     # Build document store: manages document indexing and retrieval
     document_store = DocumentStore(
@@ -74,129 +177,194 @@ def build_rag_pipeline(combined_stream):
         splitter=None,  # No chunking (treat docs as atomic units)
     )
 
-    print("✅ RAG Pipeline built successfully.")
-    return document_store
-
-def get_context(documents):
-    """Extract and concatenate text from retrieved documents
-    
-    Args:
-        documents: List of document dicts containing 'text' field
-    
-    Returns:
-        str: Space-separated concatenation of all document texts
-    """
-    content_list = []
-    for doc in documents:
-        content_list.append(str(doc["text"]))
-    return " ".join(content_list)
-
-@pw.udf
-def build_prompts_udf(documents, query) -> str:
-    """Build LLM prompt from retrieved context and user query
-    
-    Constructs zero-shot question-answering prompt:
-    - Provides retrieved documents as context
-    - Appends user query
-    - LLM uses context to formulate answer
-    
-    Args:
-        documents: Retrieved context documents
-        query: User's natural language question
-    
-    Returns:
-        str: Formatted prompt for LLM consumption
-    """
-    context = get_context(documents)
-    prompt = (
-        f"Given the following documents : \n {context} \nanswer this query: {query}"
+    # Keyword index over the same documents: updated and retracted with them,
+    # independent of the embedder (exact names, units, ship designations)
+    keyword_store = DocumentStore(
+        docs=rag_stream,
+        retriever_factory=make_keyword_factory(),
+        parser=None,
+        splitter=None,
     )
-    return prompt
 
+    print("✅ RAG Pipeline built successfully.")
+    return document_store, keyword_store, embedder
 
-def run():
+def run(simulate=False, stream_url="http://localhost:8000/v1/stream/batch", generate_batch=None,
+        generate_stream=None, query_port=8011):
     """Main execution: Orchestrate data collection, RAG pipeline, and query processing
     
     Pipeline stages:
     1. Collect multi-source data stream (news, Reddit, Telegram, RSS)
     2. Push data to backend API for frontend consumption
     3. Build RAG document store with semantic indexing
-    4. Start HTTP server for query intake
-    5. Process queries: retrieve context → build prompts → generate responses
+    4. Serve retrieval (vector or hybrid) and keyword search on internal Pathway routes
+    5. Serve chat queries: retrieve context → answer cache → batched generation
+    6. Load the embedding model and LLM in the background while data flows
+    
+    Args:
+        simulate (bool): Use the simulation source instead of live connectors
+        stream_url (str): Batch ingestion endpoint of the feed API
+        generate_batch (callable): list[str] -> list[str]; None loads TinyLlama in the background
+        generate_stream (callable): Streaming generator used with ``generate_batch``
+        query_port (int): Port of the public chat endpoint
     """
+    startup = Startup(STARTED)
+    startup.record("imports", IMPORTED - STARTED)
+    build_started = time.perf_counter()
+
     # ========== STAGE 1: DATA COLLECTION ==========
     # Merge all sources into unified event stream
-    stream = get_data_stream()
-
-    # Push raw events to backend API (port 8000)
-    # Frontend polls this endpoint for real-time updates
-    pw.io.http.write(
-        table=stream,
-        url='http://localhost:8000/v1/stream',
-        method='POST',
-        format='json'
-    )
+    stream = get_simulation_stream() if simulate else get_data_stream()
+
+    # Push raw events to backend API (port 8000), one request per commit
+    # Frontend receives them from the API's feed endpoints
+    write_batched(stream, url=stream_url)
 
     # ========== STAGE 2: RAG PIPELINE SETUP ==========
     # Build semantic document store for retrieval-augmented generation
-    document_store = build_rag_pipeline(stream)
+    document_store, keyword_store, embedder = build_rag_pipeline(stream)
    
-    # ========== STAGE 3: QUERY SERVICE ==========
-    # Initialize HTTP webserver for query intake (port 8011)
-    webserver = pw.io.http.PathwayWebserver(host="0.0.0.0", port=8011)
+    # ========== STAGE 3: RETRIEVAL SERVICE ==========
+    # Internal HTTP webserver (loopback only): the query server calls it
+    retrieve_port = int(os.getenv("FLASHPOINT_RETRIEVE_PORT", 8012))
+    webserver = pw.io.http.PathwayWebserver(host="127.0.0.1", port=retrieve_port)
 
-    # REST connector: listens for POST /v1/query, outputs responses
+    # REST connector: listens for POST /v1/retrieve, outputs retrieved documents
     queries, writer = pw.io.http.rest_connector(
         webserver=webserver,
-        route='/v1/query',
+        route='/v1/retrieve',
         schema=QuerySchema,
         autocommit_duration_ms=50,  # Batch queries every 50ms
-        delete_completed_queries=False,  # Retain query history
+        # Answered queries stay (as Pathway's own servers do): retracting them
+        # from as-of-now index queries panics the engine in Pathway 0.33
+        delete_completed_queries=False,
     )
 
-    # Normalize query format and set retrieval parameters
-    queries = queries.select(
-        query = pw.this.messages,  # User's question
-        k = 5,  # Retrieve top-5 most relevant documents
-        metadata_filter = None,  # Retrieve from all sources
-        filepath_globpattern = None,  # No file filtering
+    # Source / bias / time-range filter, evaluated by the index during the search
+    metadata_filter = pw.apply_with_type(
+        build_metadata_filter, str | None, pw.this.sources, pw.this.biases, pw.this.since, pw.this.until
     )
 
-    # ========== STAGE 4: DOCUMENT RETRIEVAL ==========
-    # Semantic search: find K most similar documents to query
-    retrieved_documents = document_store.retrieve_query(queries)
-    # Rename result column to 'docs' for downstream processing
-    retrieved_documents = retrieved_documents.select(docs=pw.this.result)
-    
-    # Join queries with their retrieved context
-    queries_context = queries + retrieved_documents
+    if retrieval_mode() == "hybrid":
+        # Vector and BM25 candidates, merged by reciprocal-rank fusion into the top-5
+        candidates = int(os.getenv("FLASHPOINT_HYBRID_CANDIDATES", 20))
+        vector_results = document_store.retrieve_query(queries.select(
+            query = pw.this.messages,
+            k = candidates,
+            metadata_filter = metadata_filter,
+            filepath_globpattern = None,
+        ))
+        keyword_results = keyword_store.retrieve_query(queries.select(
+            query = pw.apply_with_type(keyword_query, str, pw.this.messages),
+            k = candidates,
+            metadata_filter = metadata_filter,
+            filepath_globpattern = None,
+        ))
+        results = vector_results.join(keyword_results, pw.left.id == pw.right.id, id=pw.left.id).select(
+            result=pw.apply_with_type(
+                lambda vector, keyword: pw.Json(reciprocal_rank_fusion([vector.value, keyword.value], k=5)),
+                pw.Json,
+                pw.left.result,
+                pw.right.result,
+            )
+        )
+        print(f"🔀 [RAG] Hybrid retrieval (vector + BM25, {candidates} candidates each)")
+    else:
+        # Normalize query format and set retrieval parameters
+        # Semantic search: find K most similar documents to query
+        results = document_store.retrieve_query(queries.select(
+            query = pw.this.messages,  # User's question
+            k = 5,  # Retrieve top-5 most relevant documents
+            metadata_filter = metadata_filter,
+            filepath_globpattern = None,  # No file filtering
+        ))
+
+    # Response body is the list of {text, metadata, dist} documents
+    writer(results)
+
+    # Keyword search: BM25 only, no embedder or LLM on the path
+    keyword_queries, keyword_writer = pw.io.http.rest_connector(
+        webserver=webserver,
+        route='/v1/keyword',
+        schema=KeywordQuerySchema,
+        autocommit_duration_ms=10,
+        delete_completed_queries=False,
+    )
+    keyword_writer(keyword_store.retrieve_query(keyword_queries.select(
+        query = pw.apply_with_type(keyword_query, str, pw.this.messages),
+        k = pw.this.k,
+        metadata_filter = metadata_filter,
+        filepath_globpattern = None,
+    )))
+    startup.record("pipeline build", time.perf_counter() - build_started)
 
-    # ========== STAGE 5: PROMPT CONSTRUCTION ==========
-    # Build LLM prompts: context + query → formatted instruction
-    prompts = queries_context + queries_context.select(
-        prompts=build_prompts_udf(pw.this.docs, pw.this.query)
+    # ========== STAGE 4: LLM INFERENCE ==========
+    # Dynamic batching + admission control in front of the model
+    # (TinyLlama is attached by the warm-up below unless generators are given)
+    max_batch_size = int(os.getenv("FLASHPOINT_GEN_MAX_BATCH", 4))
+    scheduler = GenerationScheduler(
+        generate_batch=generate_batch,
+        generate_stream=generate_stream,
+        max_batch_size=max_batch_size,
+        batch_window=float(os.getenv("FLASHPOINT_GEN_BATCH_WINDOW_MS", 50)) / 1000,
+        max_queue=int(os.getenv("FLASHPOINT_GEN_MAX_QUEUE", 16)),
+        default_timeout=float(os.getenv("FLASHPOINT_GEN_TIMEOUT", 120)),
     )
 
-    # ========== STAGE 6: LLM INFERENCE ==========
-    # Initialize small language model (1.1B params, CPU-optimized)
-    model = llms.HFPipelineChat(
-        model="TinyLlama/TinyLlama-1.1B-Chat-v1.0",
+    # ========== STAGE 5: QUERY SERVICE ==========
+    # Similar question over the same documents → reuse the previous answer
+    answer_cache = SemanticAnswerCache(
+        threshold=float(os.getenv("FLASHPOINT_ANSWER_CACHE_THRESHOLD", 0.92)),
+        ttl=float(os.getenv("FLASHPOINT_ANSWER_CACHE_TTL", 600)),
+        max_entries=int(os.getenv("FLASHPOINT_ANSWER_CACHE_SIZE", 256)),
     )
 
-    # Generate responses using LLM with built prompts
-    # Format: chat-based QA with retrieved context
-    response = prompts.select(
-        *pw.this.without(pw.this.query, pw.this.prompts, pw.this.docs),  # Keep metadata
-        result=model(
-            llms.prompt_chat_single_qa(pw.this.prompts),
-        ),
+    # Public chat endpoint (port 8011 by default): POST /v1/query, POST /v1/query/stream (SSE)
+    # and POST /v1/search (keyword search, answered while the models still load)
+    query_app = create_query_app(
+        retrieve_url=f"http://127.0.0.1:{retrieve_port}/v1/retrieve",
+        keyword_url=f"http://127.0.0.1:{retrieve_port}/v1/keyword",
+        scheduler=scheduler,
+        answer_cache=answer_cache,
+        # Query embeddings: own in-memory LRU, the persistent cache holds documents only
+        embed=lru_cache(maxsize=int(os.getenv("FLASHPOINT_QUERY_EMBED_CACHE_SIZE", 1024)))(embedder.embed_query),
+        startup=startup,
     )
+    serve_in_background(query_app, port=query_port)
+
+    # ========== STAGE 6: MODEL WARM-UP ==========
+    # Ingest and the chat port are up already; /readyz turns 200 when both models are warm
+    def warm_embedder():
+        with startup.phase("embedder load"):
+            embedder.load_model()
+        with startup.phase("first embedding"):
+            embedder.embed_uncached(["warm-up"])
 
-    # Write responses back to HTTP client
-    writer(response)
+    def load_llm():
+        from pathway.xpacks.llm import llms
+
+        # Small language model (1.1B params, CPU-optimized)
+        with startup.phase("llm load"):
+            model = llms.HFPipelineChat(
+                model="TinyLlama/TinyLlama-1.1B-Chat-v1.0",
+                batch_size=max_batch_size,
+            )
+        scheduler.generate_batch = hf_batch_generator(model)
+        scheduler.generate_stream = hf_stream_generator(model)
+        with startup.phase("first generation"):
+            scheduler.generate_batch(["Reply with OK."])
+
+    startup.warm_up("embedder", warm_embedder)
+    if generate_batch is None:
+        startup.warm_up("llm", load_llm)
 
     # Start event loop: process stream until interrupted
-    pw.run()
+    # Engine metrics (operator latency, input/output rows) on :20000/metrics
+    # Persistence: a restart replays the snapshot instead of refetching everything
+    pw.run(
+        with_http_server=os.getenv("FLASHPOINT_ENGINE_METRICS", "1") == "1",
+        persistence_config=persistence_config(),
+    )
 
 if __name__ == "__main__":
     """Entry point: Start the Pathway RAG engine"""
@@ -0,0 +1,82 @@
+"""Prometheus Metrics for FlashPoint
+
+Shared metric definitions for both processes: the Pathway pipeline
+(``main.py``, scraped on the query server at :8011/metrics) and the feed API
+(``api.py``, scraped at :8000/metrics). Each process exposes only the
+metrics it updates.
+
+Features:
+- Per-connector counters: emitted items, duplicates skipped, errors
+- Poll duration per connector (polled feeds)
+- Seen-item stores: memory, fill ratio and estimated false-positive rate
+- Ingest lag (now - event timestamp) at index input and at the feed API
+- Feed buffer occupancy, index document count, generation queue depth
+- Embedding batch, query and LLM generation latency histograms
+"""
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# Lag spans sub-second (live sources) to hours (backfills, slow feeds)
+LAG_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600, 6 * 3600, 24 * 3600)
+# Model calls: milliseconds (cached embeddings) to minutes (TinyLlama on CPU)
+MODEL_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+# ========== CONNECTORS ==========
+CONNECTOR_EMITTED = Counter(
+    "flashpoint_connector_emitted_total", "Items emitted into the pipeline", ["connector"]
+)
+CONNECTOR_DUPLICATES = Counter(
+    "flashpoint_connector_duplicates_total", "Items skipped as already seen", ["connector"]
+)
+CONNECTOR_ERRORS = Counter(
+    "flashpoint_connector_errors_total", "Failed polls / reads (network, HTTP, parse)", ["connector"]
+)
+POLL_SECONDS = Histogram(
+    "flashpoint_connector_poll_seconds", "Duration of one feed poll (fetch + parse)", ["connector"]
+)
+DEDUP_MEMORY = Gauge("flashpoint_dedup_memory_bytes", "Bloom filter memory of a seen-item store", ["store"])
+DEDUP_FILL = Gauge(
+    "flashpoint_dedup_fill_ratio", "Share of set bits in the fullest generation of a seen-item store", ["store"]
+)
+DEDUP_FP_RATE = Gauge(
+    "flashpoint_dedup_fp_rate_estimate", "Estimated false-positive rate of a seen-item store lookup", ["store"]
+)
+
+# ========== PIPELINE ==========
+INGEST_LAG = Histogram(
+    "flashpoint_ingest_lag_seconds", "Now minus event timestamp when the event reaches a stage",
+    ["stage"], buckets=LAG_BUCKETS,
+)
+FEED_BUFFER_EVENTS = Gauge("flashpoint_feed_buffer_events", "Events held in the API feed buffer")
+INDEX_DOCUMENTS = Gauge("flashpoint_index_documents", "Documents in the retrieval index")
+EMBED_SECONDS = Histogram(
+    "flashpoint_embedding_batch_seconds", "Embedding model call per batch (cache misses only)",
+    buckets=MODEL_BUCKETS,
+)
+EMBED_TEXTS = Counter("flashpoint_embedding_texts_total", "Texts embedded", ["result"])
+
+# ========== QUERIES ==========
+QUERY_SECONDS = Histogram(
+    "flashpoint_query_seconds", "Chat and keyword search latency", ["endpoint", "status"], buckets=MODEL_BUCKETS
+)
+GENERATION_SECONDS = Histogram(
+    "flashpoint_generation_seconds", "LLM generation per model call", ["mode"], buckets=MODEL_BUCKETS
+)
+GENERATION_QUEUE = Gauge("flashpoint_generation_queue_depth", "Questions waiting for the LLM")
+
+
+def observe_lag(stage, timestamp, now):
+    """Record ingest lag of one event (missing or future timestamps count as 0)"""
+    try:
+        INGEST_LAG.labels(stage=stage).observe(max(0.0, now - float(timestamp)))
+    except (TypeError, ValueError):
+        pass
+
+
+def metrics_response():
+    """Prometheus exposition of this process' metrics
+
+    Returns:
+        tuple: (body bytes, content type)
+    """
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,176 @@
+"""Quantized ONNX Runtime Embedder for CPU Ingest
+
+Embedding every incoming message with PyTorch is the dominant CPU cost of
+ingest on GPU-less nodes. This embedder runs the same sentence-transformer
+(all-MiniLM-L6-v2 by default) through ONNX Runtime with int8 dynamic
+quantization, which is typically 2-4x faster on CPU at near-identical
+retrieval quality (see benchmarks/embedder_compare.py).
+
+Model preparation (first use, cached on disk):
+1. Export the Hugging Face encoder to ONNX (dynamic batch / sequence axes)
+2. Quantize weights to int8 (dynamic quantization of MatMul / Gemm)
+
+Inference matches sentence-transformers' MiniLM pipeline: tokenize with
+truncation at ``max_tokens``, mean pooling over the attention mask, L2
+normalization.
+
+Features:
+- Configurable batch size, intra-op thread count and max tokens per text
+- fp32 mode (``quantize=False``) for comparison
+- Drop-in Pathway embedder; ``CachedOnnxEmbedder`` adds the embedding cache
+
+Requires: pip install onnxruntime (export uses torch + transformers, which
+come with pathway[xpack-llm-local])
+"""
+
+import os
+import threading
+
+import numpy as np
+from pathway.xpacks.llm.embedders import BaseEmbedder
+
+from embedding_cache import EmbeddingCache, EmbeddingCacheMixin
+
+# Exported / quantized models (relative to backend/, like the embedding cache)
+DEFAULT_MODEL_DIR = os.getenv("FLASHPOINT_ONNX_DIR", os.path.join("..", "data", "onnx"))
+
+
+def export_onnx(model_name, path):
+    """Export a Hugging Face encoder to ONNX with dynamic batch and sequence axes"""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name).eval()
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic = {name: {0: "batch", 1: "sequence"} for name in names}
+    dynamic["last_hidden_state"] = {0: "batch", 1: "sequence"}
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[name] for name in names),
+            path,
+            input_names=names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic,
+            opset_version=14,
+        )
+    tokenizer.save_pretrained(os.path.dirname(path))
+
+
+def quantize_int8(source, target):
+    """Dynamic int8 quantization of an ONNX model's weights"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(source, target, weight_type=QuantType.QInt8)
+
+
+class OnnxEmbedder(BaseEmbedder):
+    """Sentence embedder on ONNX Runtime (optionally int8-quantized)
+
+    Attributes:
+        model_name (str): Hugging Face model id
+        quantize (bool): Use the int8 model (else fp32)
+        batch_size (int): Texts per inference call
+        threads (int): ONNX Runtime intra-op threads (None: runtime default)
+        max_tokens (int): Texts are truncated to this many tokens
+    """
+
+    def __init__(self, model="sentence-transformers/all-MiniLM-L6-v2", model_dir=DEFAULT_MODEL_DIR, quantize=True,
+                 batch_size=64, threads=None, max_tokens=256, dimension=None):
+        super().__init__(max_batch_size=batch_size)
+        self.model_name = model
+        self.quantize = quantize
+        self.batch_size = batch_size
+        self.threads = threads
+        self.max_tokens = max_tokens
+        self.dimension = dimension
+        self.model_dir = os.path.join(model_dir, model.replace("/", "__"))
+        self._session = None
+        self._tokenizer = None
+        self._input_names = ()
+        self._load_lock = threading.Lock()
+
+    @property
+    def variant(self):
+        return "int8" if self.quantize else "fp32"
+
+    def load_model(self):
+        """Export / quantize on first use, then open the inference session"""
+        with self._load_lock:
+            if self._session is not None:
+                return self._session
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+
+            fp32_path = os.path.join(self.model_dir, "model.onnx")
+            int8_path = os.path.join(self.model_dir, "model.int8.onnx")
+            if not os.path.exists(fp32_path):
+                print(f"📦 [ONNX] Exporting {self.model_name} to {fp32_path}")
+                export_onnx(self.model_name, fp32_path)
+            if self.quantize and not os.path.exists(int8_path):
+                print(f"📦 [ONNX] Quantizing to int8: {int8_path}")
+                quantize_int8(fp32_path, int8_path)
+
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if self.threads:
+                options.intra_op_num_threads = self.threads
+            session = ort.InferenceSession(
+                int8_path if self.quantize else fp32_path, options, providers=["CPUExecutionProvider"]
+            )
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+            self._input_names = tuple(i.name for i in session.get_inputs())
+            self._session = session
+            print(f"✅ [ONNX] {self.model_name} ({self.variant}, threads={self.threads or 'auto'}) loaded")
+            return session
+
+    def _encode(self, texts):
+        session = self._session or self.load_model()
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = self._tokenizer(
+                texts[start:start + self.batch_size],
+                padding=True,
+                truncation=True,
+                max_length=self.max_tokens,
+                return_tensors="np",
+            )
+            feed = {name: batch[name].astype(np.int64) for name in self._input_names}
+            hidden = session.run(None, feed)[0]
+
+            # Mean pooling over real tokens, then L2 normalization (as sentence-transformers)
+            mask = batch["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            vectors.extend(pooled.astype(np.float32))
+        return vectors
+
+    def __wrapped__(self, input: list[str], **kwargs) -> list[np.ndarray]:
+        if isinstance(input, str):
+            return self._encode([input])[0]
+        return self._encode(list(input))
+
+    def get_embedding_dimension(self, **kwargs):
+        return self.dimension or len(self._encode(["."])[0])
+
+
+class CachedOnnxEmbedder(EmbeddingCacheMixin, OnnxEmbedder):
+    """OnnxEmbedder behind the persistent embedding cache
+
+    Vectors are cached under "<model>-onnx-<variant>": they differ slightly
+    from the PyTorch model's, so the two never share cache entries.
+    """
+
+    def __init__(self, cache_dir, cache_size=100_000, **kwargs):
+        super().__init__(**kwargs)
+        dimension = self.dimension or OnnxEmbedder.get_embedding_dimension(self)
+        self.cache = EmbeddingCache(
+            cache_dir, f"{self.model_name}-onnx-{self.variant}", dimension, capacity=cache_size
+        )
+
+    def get_embedding_dimension(self, **kwargs):
+        return self.cache.dim
@@ -0,0 +1,363 @@
+"""Query Server for FlashPoint Chat
+
+Public chat endpoint (port 8011). Retrieval stays in the Pathway dataflow,
+exposed on an internal REST route; generation goes through the
+GenerationScheduler so bursts are batched, bounded and rejected early
+instead of queueing for minutes.
+
+Features:
+- POST /v1/query: {"messages": str, "timeout": optional seconds} -> answer
+- Optional retrieval filters in the body: "source" / "bias" (str or list),
+  "since" / "until" (Unix seconds) or "max_age" (seconds back from now)
+- POST /v1/query/stream: same body, answer streamed as Server-Sent Events
+  ("token" events with text chunks, then "done" with the full answer)
+- POST /v1/search: {"messages": str, "k": optional int, filters} -> BM25
+  keyword matches, without the embedder or LLM (served during warm-up)
+- 429 + Retry-After when the generation queue is full
+- 503 + Retry-After when the request's deadline passes before an answer
+- Semantic answer cache in front of the model
+- GET /v1/query/stats: queue and cache metrics
+- GET /metrics: Prometheus metrics of the pipeline process
+- GET /healthz (alive) and GET /readyz (models warm); queries get 503 +
+  Retry-After while the models are still loading
+"""
+
+import asyncio
+import math
+import threading
+import time
+
+import requests
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+
+from answer_cache import document_ids
+from feed_bus import format_sse
+from generation import DeadlineExceeded, GenerationCancelled, QueueFull
+from metrics import GENERATION_QUEUE, QUERY_SECONDS, metrics_response
+
+
+def get_context(documents):
+    """Extract and concatenate text from retrieved documents
+
+    Args:
+        documents: List of document dicts containing 'text' field
+
+    Returns:
+        str: Space-separated concatenation of all document texts
+    """
+    content_list = []
+    for doc in documents:
+        content_list.append(str(doc["text"]))
+    return " ".join(content_list)
+
+
+def build_prompt(documents, query):
+    """Build LLM prompt from retrieved context and user query
+
+    Args:
+        documents: Retrieved context documents
+        query: User's natural language question
+
+    Returns:
+        str: Formatted prompt for LLM consumption
+    """
+    context = get_context(documents)
+    return f"Given the following documents : \n {context} \nanswer this query: {query}"
+
+
+async def read_body(request):
+    """JSON object body of a request
+
+    Raises:
+        HTTPException: 400 when the body is not valid JSON or not an object
+    """
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be valid JSON")
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=400, detail="Body must be a JSON object")
+    return body
+
+
+def parse_filters(body):
+    """Retrieval filters of a chat request, in the /v1/retrieve format
+
+    Args:
+        body (dict): Request body
+
+    Returns:
+        dict: Subset of {sources, biases, since, until} (empty: no filter)
+
+    Raises:
+        HTTPException: 400 on malformed filter values
+    """
+    filters = {}
+    for field, column in (("source", "sources"), ("bias", "biases")):
+        values = body.get(field)
+        if values is None:
+            continue
+        if isinstance(values, str):
+            values = [values]
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            raise HTTPException(status_code=400, detail=f"'{field}' must be a string or a list of strings")
+        if any(c in v for v in values for c in ",`'\"\\"):
+            raise HTTPException(status_code=400, detail=f"'{field}' values may not contain commas or quotes")
+        if values:
+            filters[column] = ",".join(values)
+
+    bounds = {}
+    for field in ("since", "until", "max_age"):
+        if body.get(field) is None:
+            continue
+        try:
+            bounds[field] = float(body[field])
+        except (TypeError, ValueError):
+            bounds[field] = math.nan
+        if not math.isfinite(bounds[field]):
+            raise HTTPException(status_code=400, detail=f"'{field}' must be a number")
+    if "max_age" in bounds:
+        since = time.time() - bounds.pop("max_age")
+        bounds["since"] = max(since, bounds.get("since", since))
+    filters.update(bounds)
+    return filters
+
+
+# Retry-After for queries arriving while the models warm up
+WARMUP_RETRY_AFTER = 10
+
+# Upper bound on keyword search results per request
+MAX_SEARCH_RESULTS = 100
+
+
+def create_query_app(retrieve_url, scheduler, answer_cache, embed, startup=None, keyword_url=None):
+    """Build the FastAPI chat application
+
+    Args:
+        retrieve_url (str): Internal Pathway retrieval route
+        scheduler (GenerationScheduler): Queue in front of the LLM
+        answer_cache (SemanticAnswerCache): Cache of previous answers
+        embed (callable): str -> query embedding (for the answer cache)
+        startup (Startup): Warm-up tracker (None: always ready)
+        keyword_url (str): Internal Pathway keyword search route (None: no /v1/search)
+
+    Returns:
+        FastAPI: Application serving /v1/query and /v1/search
+    """
+    app = FastAPI()
+    session = requests.Session()
+    GENERATION_QUEUE.set_function(lambda: scheduler.queue_depth)
+
+    @app.middleware("http")
+    async def time_queries(request: Request, call_next):
+        # Full request latency of the chat and search endpoints (streams: until headers)
+        started = time.perf_counter()
+        response = await call_next(request)
+        path = request.url.path
+        if (path.startswith("/v1/query") and path != "/v1/query/stats") or path == "/v1/search":
+            QUERY_SECONDS.labels(endpoint=request.url.path, status=response.status_code).observe(
+                time.perf_counter() - started
+            )
+        return response
+
+    def retrieve(query, filters):
+        response = session.post(retrieve_url, json={"messages": query, **filters}, timeout=30)
+        response.raise_for_status()
+        return response.json()
+
+    async def prepare(request):
+        """Parse the body, retrieve context and consult the answer cache
+
+        Returns:
+            tuple: (question, docs, query vector, doc ids, cached answer or None, deadline)
+        """
+        if startup is not None and not startup.is_ready():
+            raise HTTPException(
+                status_code=503,
+                detail="Models are still loading",
+                headers={"Retry-After": str(WARMUP_RETRY_AFTER)},
+            )
+
+        body = await read_body(request)
+        question = body.get("messages", "")
+        if not isinstance(question, str):
+            raise HTTPException(status_code=400, detail="'messages' must be a string")
+        try:
+            timeout = float(body.get("timeout", scheduler.default_timeout))
+        except (TypeError, ValueError):
+            timeout = math.nan
+        if not math.isfinite(timeout) or timeout < 0:
+            raise HTTPException(status_code=400, detail="'timeout' must be a non-negative number")
+        timeout = min(timeout, scheduler.default_timeout)
+        deadline = time.monotonic() + timeout
+        filters = parse_filters(body)
+
+        try:
+            docs = await asyncio.to_thread(retrieve, question, filters)
+        except requests.RequestException as e:
+            raise HTTPException(status_code=503, detail=f"Retrieval unavailable: {e}", headers={"Retry-After": "5"})
+
+        # ========== ANSWER CACHE ==========
+        # Similar question over the same documents → reuse the previous answer
+        query_vector = await asyncio.to_thread(embed, question)
+        doc_ids = document_ids(docs)
+        cached = answer_cache.lookup(query_vector, doc_ids)
+        if cached is not None:
+            print(f"⚡ [AnswerCache] Hit {answer_cache.stats()}")
+        return question, docs, query_vector, doc_ids, cached, deadline
+
+    def submit(prompt, deadline, on_token=None):
+        """Admission control: queue the prompt or answer 429"""
+        try:
+            return scheduler.submit(prompt, timeout=deadline - time.monotonic(), on_token=on_token)
+        except QueueFull as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    def deadline_exceeded():
+        return HTTPException(
+            status_code=503,
+            detail="Deadline exceeded waiting for generation",
+            headers={"Retry-After": str(scheduler.retry_after())},
+        )
+
+    @app.post("/v1/query")
+    async def query(request: Request):
+        """Answer a question from retrieved live documents"""
+        question, docs, query_vector, doc_ids, cached, deadline = await prepare(request)
+        if cached is not None:
+            return cached
+
+        # ========== GENERATION (ADMISSION CONTROLLED) ==========
+        future = submit(build_prompt(docs, question), deadline)
+        try:
+            answer = await asyncio.wait_for(asyncio.wrap_future(future), timeout=deadline - time.monotonic())
+        except (asyncio.TimeoutError, DeadlineExceeded):
+            raise deadline_exceeded()
+
+        if answer:
+            answer_cache.store(query_vector, doc_ids, answer)
+        return answer
+
+    @app.post("/v1/query/stream")
+    async def query_stream(request: Request):
+        """Answer a question, streaming tokens as Server-Sent Events"""
+        question, docs, query_vector, doc_ids, cached, deadline = await prepare(request)
+        if cached is not None:
+            async def replay():
+                yield format_sse({"text": cached}, event="token")
+                yield format_sse({"answer": cached, "cached": True}, event="done")
+
+            return StreamingResponse(replay(), media_type="text/event-stream")
+
+        # Tokens are produced on the generation thread: hand them to the event loop
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+        disconnected = False
+
+        def on_token(text):
+            if disconnected:
+                # Client went away: stop generating for nobody
+                raise GenerationCancelled("Client disconnected")
+            loop.call_soon_threadsafe(chunks.put_nowait, text)
+
+        future = submit(build_prompt(docs, question), deadline, on_token=on_token)
+        done = asyncio.wrap_future(future)
+
+        async def stream():
+            nonlocal disconnected
+            try:
+                # Queue wait is bounded by the deadline; once tokens flow, no limit
+                first = asyncio.ensure_future(chunks.get())
+                finished, _ = await asyncio.wait(
+                    {first, done}, timeout=deadline - time.monotonic(), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not finished:
+                    first.cancel()
+                    done.cancel()
+                    yield format_sse({"detail": "Deadline exceeded waiting for generation"}, event="error")
+                    return
+                if first in finished:
+                    yield format_sse({"text": first.result()}, event="token")
+                else:
+                    first.cancel()
+
+                while not (done.done() and chunks.empty()):
+                    getter = asyncio.ensure_future(chunks.get())
+                    finished, _ = await asyncio.wait({getter, done}, return_when=asyncio.FIRST_COMPLETED)
+                    if getter in finished:
+                        yield format_sse({"text": getter.result()}, event="token")
+                    else:
+                        getter.cancel()
+
+                try:
+                    answer = done.result()
+                except Exception as e:
+                    yield format_sse({"detail": str(e)}, event="error")
+                    return
+                if answer:
+                    answer_cache.store(query_vector, doc_ids, answer)
+                yield format_sse({"answer": answer, "cached": False}, event="done")
+            finally:
+                disconnected = True
+
+        return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+    @app.post("/v1/search")
+    async def search(request: Request):
+        """Keyword (BM25) search over the live index, best match first"""
+        if keyword_url is None:
+            raise HTTPException(status_code=404, detail="Keyword search is not enabled")
+        body = await read_body(request)
+        query = str(body.get("messages", ""))
+        try:
+            k = int(body.get("k", 10))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="'k' must be an integer")
+        payload = {"messages": query, "k": max(1, min(k, MAX_SEARCH_RESULTS)), **parse_filters(body)}
+
+        def keyword_search():
+            response = session.post(keyword_url, json=payload, timeout=10)
+            response.raise_for_status()
+            return response.json()
+
+        try:
+            return await asyncio.to_thread(keyword_search)
+        except requests.RequestException as e:
+            raise HTTPException(status_code=503, detail=f"Keyword search unavailable: {e}", headers={"Retry-After": "5"})
+
+    @app.get("/v1/query/stats")
+    def stats():
+        """Generation queue and answer cache metrics"""
+        return {"generation": scheduler.stats(), "answer_cache": answer_cache.stats()}
+
+    @app.get("/healthz")
+    def healthz():
+        """Liveness: the process is up and serving"""
+        return {"status": "alive"}
+
+    @app.get("/readyz")
+    def readyz(response: Response):
+        """Readiness: 200 once the embedder and LLM are warm, else 503 (with startup breakdown)"""
+        status = startup.status() if startup is not None else {"ready": True}
+        if not status["ready"]:
+            response.status_code = 503
+        return status
+
+    @app.get("/metrics")
+    def metrics():
+        """Prometheus scrape endpoint (connectors, index, embedding, queries, LLM)"""
+        body, content_type = metrics_response()
+        return Response(content=body, media_type=content_type)
+
+    return app
+
+
+def serve_in_background(app, host="0.0.0.0", port=8011):
+    """Run the app with uvicorn on a daemon thread (Pathway owns the main thread)"""
+    server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, name="flashpoint-query-server", daemon=True)
+    thread.start()
+    print(f"💬 [Query] Chat endpoint on http://{host}:{port}/v1/query")
+    return thread
@@ -0,0 +1,120 @@
+"""Asynchronous, Single-Flight Report Jobs
+
+Report generation is a multi-second LLM call. Running it inside a sync
+request handler ties up a threadpool worker per click, and several analysts
+clicking at once each trigger their own identical call. Jobs fix both:
+
+Features:
+- Submit returns a job immediately; generation runs off the event loop
+- Single-flight: while a job is pending or running, every submit shares it,
+  even if events arrived meanwhile (during live ingest the SITREP version
+  changes every few seconds)
+- Finished reports are reused until new events arrive (version changes)
+- Clients poll, or long-poll with a wait timeout, for completion
+- Bounded history: oldest finished jobs are forgotten
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+
+# Jobs remembered for status lookups
+MAX_JOBS = 100
+
+
+class ReportJob:
+    """One report generation for a given SITREP version"""
+
+    def __init__(self, version):
+        self.id = uuid.uuid4().hex[:12]
+        self.version = version
+        self.status = "pending"  # pending -> running -> done | failed
+        self.report = None
+        self.error = None
+        self.created = time.time()
+        self.finished = None
+        self.done = asyncio.Event()
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "version": self.version,
+            "report": self.report,
+            "error": self.error,
+            "created": self.created,
+            "finished": self.finished,
+        }
+
+
+class ReportJobs:
+    """Job registry in front of a SitrepEngine (must be used on the event loop)
+
+    Attributes:
+        sitrep (SitrepEngine): Report source
+        generations (int): Report generations actually started
+        coalesced (int): Submits answered by an existing job
+    """
+
+    def __init__(self, sitrep, max_jobs=MAX_JOBS):
+        self.sitrep = sitrep
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()  # job id -> ReportJob
+        self.current = None  # Latest job (shared while in flight, reused while its version is current)
+        self.generations = 0
+        self.coalesced = 0
+
+    def submit(self):
+        """Return the job producing the report for the current feed version
+
+        Returns:
+            ReportJob: The in-flight job, the finished job if no events arrived
+            since, or a newly started one
+        """
+        version = self.sitrep.version
+        current = self.current
+        if current is not None and (
+            current.status in ("pending", "running") or (current.status == "done" and current.version == version)
+        ):
+            self.coalesced += 1
+            return current
+
+        job = ReportJob(version)
+        self.jobs[job.id] = job
+        self.current = job
+        while len(self.jobs) > self.max_jobs:
+            self.jobs.popitem(last=False)
+        self.generations += 1
+        asyncio.get_running_loop().create_task(self._generate(job))
+        return job
+
+    async def _generate(self, job):
+        job.status = "running"
+        try:
+            job.report = await asyncio.to_thread(self.sitrep.report)
+            job.status = "done"
+        except Exception as e:
+            print(f"❌ [Report] Job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        job.finished = time.time()
+        job.done.set()
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    async def wait(self, job, timeout):
+        """Wait up to ``timeout`` seconds for the job to finish
+
+        Returns:
+            bool: True if finished
+        """
+        try:
+            await asyncio.wait_for(job.done.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return job.done.is_set()
+
+    def stats(self):
+        return {"jobs": len(self.jobs), "generations": self.generations, "coalesced": self.coalesced}
@@ -0,0 +1,90 @@
+"""Sliding Time-Window Retention for the FlashPoint Document Index
+
+Without retention the DocumentStore only ever grows: memory and query cost
+rise with uptime. This module keeps the index to the last N hours of events
+(by the event ``timestamp`` column): Pathway retracts expired rows
+incrementally, so the KNN index drops them and a long-running deployment
+reaches a steady footprint.
+
+Configuration (environment):
+- FLASHPOINT_RETENTION_HOURS: window length, default 48 (0 disables retention)
+"""
+
+import os
+import time
+
+import pathway as pw
+
+# Seconds between index-size log lines
+LOG_INTERVAL = 60
+
+
+def retention_seconds():
+    """Configured retention window in seconds (0 = keep everything)"""
+    return float(os.getenv("FLASHPOINT_RETENTION_HOURS", 48)) * 3600
+
+
+@pw.udf
+def _clamp_to_now(timestamp: float) -> float:
+    # A single future-dated event (clock skew, bad feed) would otherwise
+    # advance the watermark and expire the whole index
+    return min(timestamp, time.time())
+
+
+def apply_retention(stream, window_seconds):
+    """Keep only rows whose timestamp is within ``window_seconds`` of the newest
+
+    Expiry is driven by event time: once an event newer than
+    ``timestamp + window`` arrives, the row is retracted. Events that are
+    already older than the window when they arrive are never indexed.
+
+    Args:
+        stream: Pathway table with a float ``timestamp`` column (Unix seconds)
+        window_seconds (float): Retention window; <= 0 disables retention
+
+    Returns:
+        Pathway table: Same schema, with expired rows retracted
+    """
+    if window_seconds <= 0:
+        return stream
+    stream = stream.with_columns(_event_time=_clamp_to_now(pw.this.timestamp))
+    retained = stream._forget(
+        pw.this._event_time + window_seconds,
+        pw.this._event_time,
+        mark_forgetting_records=False,
+    )
+    return retained.without(pw.this._event_time)
+
+
+class IndexSizeGauge:
+    """Live count of documents in the index (updated from the dataflow)
+
+    Attributes:
+        value (int): Current number of indexed documents
+    """
+
+    def __init__(self):
+        self.value = 0
+        self._last_log = 0.0
+
+    def _on_change(self, key, row, time, is_addition):
+        if is_addition:
+            self.value = row["count"]
+        elif row["count"] == self.value:
+            # Table emptied (no replacement count in this batch)
+            self.value = 0
+
+    def _on_time_end(self, batch_time):
+        now = time.time()
+        if now - self._last_log >= LOG_INTERVAL:
+            self._last_log = now
+            print(f"📚 [RAG] Index size: {self.value} documents")
+
+    def track(self, docs):
+        """Subscribe to the row count of the table feeding the index"""
+        counts = docs.reduce(count=pw.reducers.count())
+        pw.io.subscribe(counts, on_change=self._on_change, on_time_end=self._on_time_end, name="Index Size")
+
+
+# Process-wide gauge for the RAG index
+index_size = IndexSizeGauge()
@@ -0,0 +1,181 @@
+"""Retriever Factory Selection for the FlashPoint RAG Pipeline
+
+Chooses the nearest-neighbor index behind the DocumentStore. Brute force
+scans every document per query (O(n)); after a few days of Telegram +
+Reddit + RSS that dominates query latency, so the default is an HNSW
+index (USearch) that Pathway updates incrementally as documents are added
+and retracted.
+
+Configuration (environment):
+- FLASHPOINT_RETRIEVER: "hnsw" (default), "bruteforce" or "lsh"
+- FLASHPOINT_HNSW_CONNECTIVITY: max edges per HNSW node (0 = auto)
+- FLASHPOINT_HNSW_EXPANSION_ADD: build-time search width (0 = auto)
+- FLASHPOINT_HNSW_EXPANSION_SEARCH: query-time search width (0 = auto)
+- FLASHPOINT_INDEX_RESERVED_SPACE: initial index capacity (grows as needed)
+
+Alongside the vector index, a BM25 inverted index (Tantivy, maintained by
+the Pathway engine as documents arrive and expire) serves exact-name
+lookups: units, ships, places that MiniLM embeddings retrieve poorly.
+
+- FLASHPOINT_RETRIEVAL: "vector" (default) or "hybrid" (vector + BM25
+  rankings merged with reciprocal-rank fusion)
+- FLASHPOINT_HYBRID_CANDIDATES: documents taken from each ranking before fusion
+- FLASHPOINT_BM25_RAM_MB: in-memory budget of the BM25 index
+
+Queries can be narrowed by source, bias and time range. The filter is a
+JMESPath expression over document metadata that the index evaluates during
+the search, so the top-k slots only go to matching documents.
+"""
+
+import os
+import re
+
+from pathway.stdlib.indexing import TantivyBM25Factory, USearchMetricKind
+from pathway.stdlib.indexing.nearest_neighbors import (
+    BruteForceKnnFactory,
+    LshKnnFactory,
+    UsearchKnnFactory,
+)
+
+RETRIEVER_KINDS = ("hnsw", "bruteforce", "lsh")
+RETRIEVAL_MODES = ("vector", "hybrid")
+
+# Rank offset of reciprocal-rank fusion (60 as in Cormack et al.)
+RRF_K = 60
+
+
+def _env_int(name, default):
+    return int(os.getenv(name, default))
+
+
+def hnsw_params():
+    """HNSW settings of the "hnsw" retriever (benchmarks.ann_recall measures these)
+
+    Returns:
+        dict: UsearchKnnFactory arguments: metric, connectivity, expansion_add
+        and expansion_search (0 = chosen by USearch)
+    """
+    return {
+        "metric": USearchMetricKind.COS,
+        "connectivity": _env_int("FLASHPOINT_HNSW_CONNECTIVITY", 0),
+        "expansion_add": _env_int("FLASHPOINT_HNSW_EXPANSION_ADD", 0),
+        "expansion_search": _env_int("FLASHPOINT_HNSW_EXPANSION_SEARCH", 0),
+    }
+
+
+def make_retriever_factory(embedder, kind=None):
+    """Build the KNN retriever factory for the document store
+
+    Args:
+        embedder: Pathway embedder UDF used for documents and queries
+        kind (str): One of RETRIEVER_KINDS; defaults to $FLASHPOINT_RETRIEVER
+
+    Returns:
+        Pathway retriever factory
+    """
+    kind = (kind or os.getenv("FLASHPOINT_RETRIEVER", "hnsw")).lower()
+    reserved_space = _env_int("FLASHPOINT_INDEX_RESERVED_SPACE", 10_000)
+
+    if kind == "hnsw":
+        # Incremental HNSW graph: inserts/deletions in O(log n), sublinear queries
+        factory = UsearchKnnFactory(embedder=embedder, reserved_space=reserved_space, **hnsw_params())
+    elif kind == "bruteforce":
+        # Exact search; scales O(n) per query
+        factory = BruteForceKnnFactory(embedder=embedder, reserved_space=reserved_space)
+    elif kind == "lsh":
+        # Locality-sensitive hashing over cosine distance
+        factory = LshKnnFactory(embedder=embedder, distance_type="cosine")
+    else:
+        raise ValueError(f"Unknown retriever '{kind}', expected one of {RETRIEVER_KINDS}")
+
+    print(f"🔎 [RAG] Using {kind} retriever")
+    return factory
+
+
+def retrieval_mode():
+    """Chat retrieval mode from $FLASHPOINT_RETRIEVAL"""
+    mode = os.getenv("FLASHPOINT_RETRIEVAL", "vector").lower()
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(f"Unknown retrieval mode '{mode}', expected one of {RETRIEVAL_MODES}")
+    return mode
+
+
+# ========== KEYWORD INDEX (BM25) ==========
+
+def make_keyword_factory():
+    """BM25 inverted index factory (no embedder: indexing never waits on the model)"""
+    ram_budget = _env_int("FLASHPOINT_BM25_RAM_MB", 50) * 1024 * 1024
+    print(f"🔤 [RAG] BM25 keyword index ({ram_budget // (1024 * 1024)} MB in memory)")
+    return TantivyBM25Factory(ram_budget=ram_budget)
+
+
+def keyword_query(text):
+    """Plain lowercase terms for the BM25 query parser
+
+    Operators, quotes and field prefixes ("AND", '"...', "ship:") are query
+    syntax to Tantivy, and a syntax error fails inside the engine.
+    """
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def reciprocal_rank_fusion(rankings, k=5, rrf_k=RRF_K):
+    """Merge ranked document lists: score = sum over lists of 1 / (rrf_k + rank)
+
+    Args:
+        rankings (list): Retrieved document lists ({text, metadata, dist}), best first
+        k (int): Documents to keep
+        rrf_k (int): Rank offset; larger values flatten the head of each list
+
+    Returns:
+        list: Top-k documents, best first, with dist = -fused score
+    """
+    scores = {}
+    docs = {}
+    for ranking in rankings:
+        for rank, doc in enumerate(ranking or [], start=1):
+            key = (doc.get("metadata") or {}).get("url") or doc.get("text", "")
+            scores[key] = scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            docs.setdefault(key, doc)
+    best = sorted(scores, key=scores.get, reverse=True)[:k]
+    return [{**docs[key], "dist": -scores[key]} for key in best]
+
+
+# ========== METADATA FILTERS ==========
+
+def _split(values):
+    """Comma-separated filter values; backticks / quotes would break the expression"""
+    if not values:
+        return []
+    return [v.strip() for v in values.split(",") if v.strip() and not any(c in v for c in "`'\"\\")]
+
+
+def build_metadata_filter(sources=None, biases=None, since=None, until=None):
+    """JMESPath filter for the document store's ``metadata_filter`` column
+
+    A source matches itself and its sub-sources ("GNews" matches
+    "GNews/BBC"). String literals use backticks, which Pathway rewrites to
+    quotes; numbers go through to_number() for the same reason.
+
+    Args:
+        sources (str): Comma-separated sources (any of)
+        biases (str): Comma-separated bias tags (any of)
+        since (float): Oldest event timestamp (Unix seconds)
+        until (float): Newest event timestamp (Unix seconds)
+
+    Returns:
+        str: Filter expression, or None to search every document
+    """
+    clauses = []
+    source_terms = [
+        f"source == `{source}` || starts_with(source, `{source}/`)" for source in _split(sources)
+    ]
+    if source_terms:
+        clauses.append("(" + " || ".join(source_terms) + ")")
+    bias_terms = [f"bias == `{bias}`" for bias in _split(biases)]
+    if bias_terms:
+        clauses.append("(" + " || ".join(bias_terms) + ")")
+    if since is not None:
+        clauses.append(f"timestamp >= to_number(`{float(since)!r}`)")
+    if until is not None:
+        clauses.append(f"timestamp <= to_number(`{float(until)!r}`)")
+    return " && ".join(clauses) or None
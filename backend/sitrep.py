@@ -0,0 +1,344 @@
+"""Rolling SITREP Engine for FlashPoint Reports
+
+Sending the whole feed buffer to the LLM on every report click re-summarizes
+the same events each time and caps the context at the buffer size. This
+engine maintains the report incrementally (map-reduce):
+
+- Map: events are partitioned by region (resolved place, else "Global") and
+  time window. Each partition keeps a partial summary that is updated only
+  when new events land in it, by folding the new events into the previous
+  summary (background refresher thread). The refresher only runs while
+  reports are being requested, only for partitions a report would include,
+  and at most ``max_refresh`` model calls per tick, so an idle dashboard
+  costs no LLM quota. Each call folds at most ``MAP_BATCH_EVENTS`` events,
+  and a partition holds at most ``MAX_PENDING_EVENTS`` unsummarized events
+  (oldest dropped), so prompts stay bounded after a long idle period.
+- Reduce: a report is one merge call over the partial summaries (plus any
+  events that arrived since the last refresh), cached until events or
+  summaries change. The first report after an idle period runs one bounded
+  refresh first; if events are still left out, the report says how many.
+
+Features:
+- Pluggable backend: Gemini, or a deterministic extractive stub for offline use
+- Bounded state: partitions older than the horizon are dropped
+- Stats: partitions, dirty partitions, pending/dropped events, map/merge call counters
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+# Partition window length (seconds)
+WINDOW_SECONDS = 3600
+# Partitions older than this (relative to the newest event) are dropped
+HORIZON_SECONDS = 24 * 3600
+# Most recently updated partitions included in a report
+MERGE_PARTITIONS = 24
+# Raw not-yet-summarized events per partition passed to the merge step
+MERGE_PENDING_EVENTS = 5
+# Events folded into a partition summary per map call
+MAP_BATCH_EVENTS = 50
+# Unsummarized events kept per partition (oldest dropped beyond this)
+MAX_PENDING_EVENTS = 500
+# Seconds between background refreshes of dirty partitions
+REFRESH_INTERVAL = 30
+# Most partition summaries updated per refresh tick (map calls)
+MAX_REFRESH_PER_TICK = 4
+# Background refreshes continue this long after the last report request
+ACTIVE_SECONDS = 1800
+
+
+def window_label(window_start):
+    return datetime.fromtimestamp(window_start, tz=timezone.utc).strftime("%d %b %H:%M UTC")
+
+
+def format_event(event):
+    return f"- {event.get('text', '')}-{event.get('source', 'Unknown')}-{event.get('bias', 'Neutral')}"
+
+
+class Partition:
+    """Events of one region in one time window, with their running summary"""
+
+    def __init__(self, region, window_start):
+        self.region = region
+        self.window_start = window_start
+        self.summary = ""
+        self.pending = []  # Events not yet folded into the summary
+        self.dropped = 0  # Events dropped from a full pending list, never summarized
+        self.count = 0
+        self.updated = 0.0
+
+    @property
+    def label(self):
+        return f"{self.region} ({window_label(self.window_start)})"
+
+
+# ========== BACKENDS ==========
+
+class StubBackend:
+    """Deterministic extractive backend: no model calls (offline / tests)"""
+
+    max_lines = 8
+
+    def summarize(self, label, previous, events):
+        lines = previous.splitlines() if previous else []
+        lines += [f"- {e.get('text', '')[:200]} [{e.get('source', 'Unknown')}]" for e in events]
+        return "\n".join(lines[-self.max_lines:])
+
+    def merge(self, partials):
+        regions = sorted({label.split(" (")[0] for label, _ in partials})
+        developments = []
+        for label, text in partials:
+            first = text.splitlines()[0].lstrip("- ") if text else ""
+            developments.append(f"- **{label}**: {first}")
+        return (
+            "## Global Situation Summary\n"
+            f"Reporting covers {len(partials)} region/time partitions across {len(regions)} regions: "
+            f"{', '.join(regions)}.\n\n"
+            "## Key Developments\n" + "\n".join(developments) + "\n\n"
+            "## Outlook\nNo forecast (offline summary backend)."
+        )
+
+
+class GeminiBackend:
+    """Google Gemini backend (map and merge prompts)
+
+    The client library is imported and the model built on first use
+    (``load_model`` returns the GenerativeModel), keeping it off the import path.
+    """
+
+    def __init__(self, load_model):
+        self._load_model = load_model
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        with self._lock:
+            if self._model is None:
+                self._model = self._load_model()
+            return self._model
+
+    def summarize(self, label, previous, events):
+        prompt = f"""TASK: Maintain a running intelligence summary for {label}.
+        CONSTRAINTS:
+        1. Use ONLY the previous summary and the new items below. Do NOT invent data.
+        2. Output 2-5 bullet points, each citing the source name in brackets [Source].
+        3. Reply in plain text, do not give response in markdown
+
+        PREVIOUS SUMMARY:
+        {previous or "(none)"}
+
+        NEW ITEMS:
+        {chr(10).join(format_event(e) for e in events)}
+        """
+        return self.model.generate_content(prompt).text
+
+    def merge(self, partials):
+        context_text = "\n\n".join(f"[{label}]\n{text}" for label, text in partials)
+        prompt = f""" TASK: Synthesize the provided regional summaries into a professional News Briefing.
+        CONSTRAINTS:
+        1. Use ONLY the provided text below. Do NOT fill in missing data like names, dates, or events not present.
+        2. Tone: Objective, Journalistic, Concise.
+        3. Cite the source name in brackets [Source] for every claim.
+        4. Reply in plain text, do not give response in markdown
+
+        REGIONAL SUMMARIES:
+        {context_text}
+
+        REQUIRED OUTPUT FORMAT:
+        ##  Global Situation Summary
+        [Write a 2-3 sentence executive summary of the provided text]
+
+        ## Key Developments
+        - **[Category/Region]**: [Detail] [Source]
+        - **[Category/Region]**: [Detail] [Source]
+
+        ## Outlook
+        [Short forecast based *only* on the provided trends]
+    """
+        return self.model.generate_content(prompt).text
+
+
+def make_backend(load_gemini_model=None):
+    """Select the backend from FLASHPOINT_SITREP_BACKEND ("gemini" or "stub")
+
+    Falls back to the stub when Gemini is requested but unavailable.
+
+    Args:
+        load_gemini_model (callable): Builds the Gemini model (None: no API key)
+    """
+    kind = os.getenv("FLASHPOINT_SITREP_BACKEND", "gemini").lower()
+    if kind == "gemini" and load_gemini_model is not None:
+        return GeminiBackend(load_gemini_model)
+    return StubBackend()
+
+
+# ========== ENGINE ==========
+
+class SitrepEngine:
+    """Incrementally maintained map-reduce situation report
+
+    Attributes:
+        backend: Object with summarize(label, previous, events) and merge(partials)
+        version (int): Incremented on every added event and summary update
+        map_calls (int): Partition summary updates performed
+        merge_calls (int): Report merges performed
+    """
+
+    def __init__(self, backend, window_seconds=WINDOW_SECONDS, horizon_seconds=HORIZON_SECONDS,
+                 max_refresh=MAX_REFRESH_PER_TICK, active_seconds=ACTIVE_SECONDS):
+        self.backend = backend
+        self.max_refresh = max_refresh
+        self.active_seconds = active_seconds
+        self.last_request = None  # time.time() of the last report request
+        self.window_seconds = window_seconds
+        self.horizon_seconds = horizon_seconds
+        self.partitions = {}  # (region, window_start) -> Partition
+        self.version = 0
+        self.map_calls = 0
+        self.merge_calls = 0
+        self._report = None  # (version, text)
+        self._newest = 0.0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, event):
+        """Route an event to its (region, window) partition"""
+        timestamp = float(event.get("timestamp") or time.time())
+        region = event.get("place") or "Global"
+        key = (region, timestamp - timestamp % self.window_seconds)
+        with self._lock:
+            if timestamp < self._newest - self.horizon_seconds:
+                return  # Already outside the report horizon
+            partition = self.partitions.get(key)
+            if partition is None:
+                partition = self.partitions[key] = Partition(*key)
+            if len(partition.pending) >= MAX_PENDING_EVENTS:
+                del partition.pending[0]
+                partition.dropped += 1
+            partition.pending.append(event)
+            partition.count += 1
+            partition.updated = time.time()
+            self.version += 1
+            if timestamp > self._newest:
+                self._newest = timestamp
+                self._expire()
+
+    def _expire(self):
+        cutoff = self._newest - self.horizon_seconds
+        for key in [k for k in self.partitions if k[1] + self.window_seconds < cutoff]:
+            del self.partitions[key]
+
+    def _recent(self):
+        """Partitions a report merges: the most recently updated ones"""
+        return sorted(self.partitions.values(), key=lambda p: p.updated, reverse=True)[:MERGE_PARTITIONS]
+
+    def refresh(self, limit=None):
+        """Fold pending events into their partition summaries (map step)
+
+        Only partitions the next report would include are refreshed, most
+        recently updated first. Each partition folds its oldest
+        ``MAP_BATCH_EVENTS`` pending events per call; the rest wait for the
+        next refresh.
+
+        Args:
+            limit (int): Most partitions to summarize (None: all of them)
+
+        Returns:
+            int: Partitions updated
+        """
+        with self._lock:
+            dirty = [(p, p.pending[:MAP_BATCH_EVENTS], p.summary) for p in self._recent() if p.pending][:limit]
+        for partition, events, previous in dirty:
+            try:
+                summary = self.backend.summarize(partition.label, previous, events)
+            except Exception as e:
+                print(f"❌ [SITREP] Summary failed for {partition.label}: {e}")
+                continue
+            with self._lock:
+                partition.summary = summary
+                # Events that arrived (or were dropped) during the call: remove only what was folded
+                folded = {id(e) for e in events}
+                partition.pending = [e for e in partition.pending if id(e) not in folded]
+                self.map_calls += 1
+                self.version += 1  # Summaries changed: cached report is stale
+        return len(dirty)
+
+    def report(self):
+        """Current report: one merge call, cached until events or summaries change
+
+        After an idle period (refresher inactive) one bounded refresh runs
+        first. Events that are still neither summarized nor passed raw to the
+        merge are counted in a note at the end of the report.
+
+        Returns:
+            str: Formatted SITREP
+        """
+        with self._lock:
+            cold = not self.active()
+            self.last_request = time.time()
+        if cold:
+            self.refresh(limit=self.max_refresh)
+
+        with self._lock:
+            version = self.version
+            if self._report and self._report[0] == version:
+                return self._report[1]
+            partials, total, backlog, dropped = [], 0, 0, 0
+            for partition in self._recent():
+                text = partition.summary
+                if partition.pending:
+                    # Not summarized yet: pass the newest raw events along
+                    fresh = "\n".join(format_event(e) for e in partition.pending[-MERGE_PENDING_EVENTS:])
+                    text = f"{text}\n{fresh}" if text else fresh
+                partials.append((partition.label, text))
+                total += partition.count
+                backlog += max(0, len(partition.pending) - MERGE_PENDING_EVENTS)
+                dropped += partition.dropped
+
+        if not partials:
+            return "No events received yet."
+        report = self.backend.merge(partials)
+        if backlog or dropped:
+            report += (
+                f"\n\n_Partial report: {backlog + dropped} of {total} events are not reflected above "
+                f"({backlog} awaiting summary, {dropped} dropped from an overfull backlog)._"
+            )
+        with self._lock:
+            self.merge_calls += 1
+            self._report = (version, report)
+        return report
+
+    def active(self):
+        """True while reports have been requested within ``active_seconds``"""
+        return self.last_request is not None and time.time() - self.last_request < self.active_seconds
+
+    def _run(self, interval):
+        while True:
+            time.sleep(interval)
+            if not self.active():
+                continue  # Nobody is reading reports: spend no model calls
+            updated = self.refresh(limit=self.max_refresh)
+            if updated:
+                print(f"📝 [SITREP] Refreshed {updated} partitions ({len(self.partitions)} live)")
+
+    def start(self, interval=REFRESH_INTERVAL):
+        """Refresh dirty partitions in the background every ``interval`` seconds (while active)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, args=(interval,), name="flashpoint-sitrep", daemon=True)
+            self._thread.start()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "partitions": len(self.partitions),
+                "dirty": sum(1 for p in self.partitions.values() if p.pending),
+                "pending_events": sum(len(p.pending) for p in self.partitions.values()),
+                "dropped_events": sum(p.dropped for p in self.partitions.values()),
+                "active": self.active(),
+                "version": self.version,
+                "map_calls": self.map_calls,
+                "merge_calls": self.merge_calls,
+            }
@@ -0,0 +1,112 @@
+"""Startup Phases and Readiness for FlashPoint Services
+
+Model loading used to happen before anything was served: a cold start
+blocked the feed and query ports until TinyLlama and the embedder were in
+memory. Services now start serving immediately and load models in the
+background; this module tracks that warm-up.
+
+Features:
+- Timed startup phases (imports, pipeline build, model loads, first
+  embedding / generation), each logged as it finishes
+- Background warm-up tasks that mark a component ready when done
+- Liveness vs readiness: a service is alive once it serves requests and
+  ready once every required component has warmed up
+- One summary line with the full startup breakdown once ready
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Startup:
+    """Startup timeline and readiness of one process
+
+    Attributes:
+        t0 (float): perf_counter() at process start (before heavy imports)
+        phases (dict): Phase name -> seconds
+        components (dict): Required component -> ready flag
+    """
+
+    def __init__(self, t0=None):
+        self.t0 = t0 if t0 is not None else time.perf_counter()
+        self.phases = {}
+        self.components = {}
+        self.ready_at = None
+        self._lock = threading.Lock()
+
+    def elapsed(self):
+        return time.perf_counter() - self.t0
+
+    def record(self, name, seconds):
+        """Record a phase measured elsewhere (e.g. module imports)"""
+        with self._lock:
+            self.phases[name] = round(seconds, 3)
+        print(f"⏱️ [Startup] {name}: {seconds:.2f}s (t+{self.elapsed():.2f}s)")
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as startup phase ``name``"""
+        started = time.perf_counter()
+        yield
+        self.record(name, time.perf_counter() - started)
+
+    # ========== READINESS ==========
+
+    def require(self, *components):
+        """Declare components that must warm up before the process is ready"""
+        with self._lock:
+            for component in components:
+                self.components.setdefault(component, False)
+
+    def set_ready(self, component):
+        with self._lock:
+            self.components[component] = True
+            ready = all(self.components.values())
+            first = ready and self.ready_at is None
+            if first:
+                self.ready_at = round(self.elapsed(), 3)
+        if first:
+            breakdown = " | ".join(f"{name} {seconds:.2f}s" for name, seconds in self.phases.items())
+            print(f"🚀 [Startup] Ready after {self.ready_at:.2f}s" + (f": {breakdown}" if breakdown else ""))
+
+    def is_ready(self, component=None):
+        with self._lock:
+            if component is not None:
+                return self.components.get(component, False)
+            return all(self.components.values())
+
+    def warm_up(self, component, load):
+        """Run ``load()`` on a background thread, then mark ``component`` ready
+
+        Args:
+            component (str): Required component name
+            load (callable): Loads / warms the component (may record phases)
+
+        Returns:
+            threading.Thread: The warm-up thread
+        """
+        self.require(component)
+
+        def run():
+            try:
+                load()
+            except Exception as e:
+                print(f"❌ [Startup] Warm-up of {component} failed: {e}")
+                return
+            self.set_ready(component)
+
+        thread = threading.Thread(target=run, name=f"flashpoint-warmup-{component}", daemon=True)
+        thread.start()
+        return thread
+
+    def status(self):
+        """Readiness report for /readyz"""
+        with self._lock:
+            return {
+                "ready": all(self.components.values()),
+                "components": dict(self.components),
+                "phases": dict(self.phases),
+                "ready_at": self.ready_at,
+                "uptime": round(self.elapsed(), 3),
+            }
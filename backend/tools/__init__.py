@@ -0,0 +1,4 @@
+"""Tools Module: Offline Build Utilities
+
+- build_gazetteer.py: compile GeoNames dumps into the memory-mapped gazetteer binary
+"""
@@ -0,0 +1,102 @@
+"""Build the FlashPoint gazetteer binary from GeoNames dumps
+
+Reads one or more files in the GeoNames "geoname" tab-separated format
+(e.g. cities15000.txt, or allCountries.txt for countries and regions),
+keeps populated places and administrative divisions, and compiles them
+with their aliases into the memory-mappable format used by the API.
+
+Usage (from backend/):
+    curl -O https://download.geonames.org/export/dump/cities15000.zip && unzip cities15000.zip
+    python -m tools.build_gazetteer cities15000.txt -o ../data/gazetteer.bin
+
+Place data: GeoNames (https://www.geonames.org), CC BY 4.0.
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+
+from gazetteer import (
+    LEVEL_CITY,
+    LEVEL_COUNTRY,
+    LEVEL_DISTRICT,
+    LEVEL_REGION,
+    SEED_PLACES,
+    compile_gazetteer,
+)
+
+# GeoNames feature codes -> specificity level (others are skipped)
+COUNTRY_CODES = {"PCLI", "PCLD", "PCLF", "PCLS", "PCLIX", "PCL", "TERR"}
+REGION_CODES = {"ADM1"}
+DISTRICT_CODES = {"ADM2"}
+
+# Alternate names longer than this are usually descriptions, not names
+MAX_ALIAS_LENGTH = 40
+
+csv.field_size_limit(sys.maxsize)
+
+
+def feature_level(feature_class, feature_code):
+    if feature_class == "P":
+        return LEVEL_CITY
+    if feature_code in COUNTRY_CODES:
+        return LEVEL_COUNTRY
+    if feature_code in REGION_CODES:
+        return LEVEL_REGION
+    if feature_code in DISTRICT_CODES:
+        return LEVEL_DISTRICT
+    return None
+
+
+def keep_alias(alias):
+    """Skip codes (IATA, ISO), URLs and overly long alternate names"""
+    if len(alias) < 3 or len(alias) > MAX_ALIAS_LENGTH:
+        return False
+    if not any(ch.islower() for ch in alias):
+        return False
+    return all(ch.isalpha() or ch in " -'." for ch in alias)
+
+
+def read_geonames(path, min_population):
+    """Yield (name, aliases, lat, lon, population, level) from a GeoNames dump"""
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) < 15:
+                continue
+            level = feature_level(row[6], row[7])
+            population = int(row[14] or 0)
+            if level is None or (level == LEVEL_CITY and population < min_population):
+                continue
+            aliases = [a for a in row[3].split(",") if keep_alias(a)]
+            if row[2] and row[2] != row[1]:
+                aliases.append(row[2])  # ASCII spelling
+            yield row[1], aliases, float(row[4]), float(row[5]), population, level
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="GeoNames geoname-format .txt dumps")
+    parser.add_argument("-o", "--output", default=os.path.join("..", "data", "gazetteer.bin"))
+    parser.add_argument("--min-population", type=int, default=15000, help="Skip smaller populated places")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    places = list(SEED_PLACES)
+    for path in args.inputs:
+        places.extend(read_geonames(path, args.min_population))
+    n_aliases = sum(len(p[1]) + 1 for p in places)
+
+    blob = compile_gazetteer(places)
+    with open(args.output, "wb") as f:
+        f.write(blob)
+
+    print(
+        f"✅ Compiled {len(places)} places / {n_aliases} names into {args.output} "
+        f"({len(blob) / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,9 @@ functional changes were made.
 """
 
 import os
+import json
 import base64
+import itertools
 from datetime import datetime
 
 import streamlit as st
@@ -16,6 +18,7 @@ import requests
 from streamlit_folium import st_folium
 
 from report import create_pdf, trigger_auto_download
+from feed_client import LiveFeed
 
 # Base URL for back-end APIs (port appended at call sites)
 API_BASE_URL = "http://localhost:"
@@ -92,35 +95,78 @@ if "messages" not in st.session_state:
     st.session_state.messages = []
 
 
+@st.cache_resource
+def get_live_feed():
+    """Single SSE-backed feed mirror shared by every session of this server process."""
+    return LiveFeed(f"{API_BASE_URL}8000")
+
+
 def fetch_feed():
-    """Request latest feed items from the backend; return list or empty list on error."""
-    try:
-        response = requests.get(f"{API_BASE_URL}8000/v1/frontend/feed")
-        if response.status_code == 200:
-            return response.json()
-    except Exception:
-        # Keep UI resilient to transient backend failures
-        return []
-    return []
+    """Return the latest feed items (oldest first) from the push-fed local buffer."""
+    return get_live_feed().snapshot()
 
 
-def send_chat_query(query):
-    """Send a chat query to the intelligence API and return its response.
+def stream_chat_query(query):
+    """Stream a chat answer from the intelligence API, yielding text chunks.
 
-    On error, return a short error string that can be displayed to the user.
+    The backend sends Server-Sent Events: "token" events carry text as
+    TinyLlama produces it, "done" ends the answer. Errors are yielded as a
+    short string that can be displayed to the user.
     """
     try:
-        response = requests.post(f"{API_BASE_URL}8011/v1/query", json={"messages": query})
-        if response.status_code == 200:
-            return response.json()
-        return "⚠️ Connection Error: Intel Core Unreachable."
+        with requests.post(
+            f"{API_BASE_URL}8011/v1/query/stream",
+            json={"messages": query},
+            headers={"Accept": "text/event-stream"},
+            stream=True,
+            timeout=(5, 300),
+        ) as response:
+            if response.status_code in (429, 503):
+                retry_after = response.headers.get("Retry-After", "a few")
+                yield f"⏳ Intel Core at capacity. Retry in {retry_after}s."
+                return
+            if response.status_code != 200:
+                yield "⚠️ Connection Error: Intel Core Unreachable."
+                return
+
+            event = None
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    payload = json.loads(line[5:].strip())
+                    if event == "token":
+                        yield payload["text"]
+                    elif event == "error":
+                        yield f"\n\n⚠️ {payload['detail']}"
+                        return
+                    elif event == "done":
+                        return
     except Exception as e:
-        return f"⚠️ System Error: {e}"
+        yield f"⚠️ System Error: {e}"
 
 
-@st.fragment(run_every="2s")
+def request_report(timeout=180):
+    """Submit a report job and long-poll until it finishes.
+
+    Returns the report text, or None if the job failed or timed out.
+    """
+    res = requests.post(f"{API_BASE_URL}8000/v1/reports", timeout=10)
+    if res.status_code not in (200, 202):
+        return None
+    job = res.json()
+    deadline = datetime.now().timestamp() + timeout
+    while job["status"] in ("pending", "running") and datetime.now().timestamp() < deadline:
+        res = requests.get(f"{API_BASE_URL}8000/v1/reports/{job['job_id']}", params={"wait": 25}, timeout=35)
+        if res.status_code != 200:
+            return None
+        job = res.json()
+    return job["report"] if job["status"] == "done" else None
+
+
+@st.fragment(run_every="1s")
 def render_live_feed():
-    """Render the live feed panel; polls backend and writes short cards for each item."""
+    """Render the live feed panel from the local push-fed buffer as short cards."""
     items = fetch_feed()
     west, east = calculate_narrative_balance(items)
     st.session_state["divergence"] = [west, east]
@@ -139,11 +185,19 @@ def render_live_feed():
         if "Russia" in bias or "China" in bias:
             card_class += " alert-card"
 
+        # Near-duplicates are collapsed into their original by the backend
+        copies = item.get("duplicates", [])
+        also = ""
+        if copies:
+            names = ", ".join(sorted({c.get("source", "?") for c in copies}))
+            also = f'<div style="color:#94a3b8;font-size:0.8em;margin-top:4px;">+{len(copies)} similar: {names}</div>'
+
         st.markdown(
             f"""
             <div class="{card_class}">
                 <small style="color:#94a3b8;font-weight:bold;">{source} • {bias}</small>
                 <div style="color:#e2e8f0;margin-top:4px;">{text}</div>
+                {also}
             </div>
             """,
             unsafe_allow_html=True,
@@ -237,13 +291,14 @@ with col_feed:
     with st.container(height=500):
         render_live_feed()
 
-    # Generate report button: requests backend and stores report text in session state
+    # Generate report button: submits a report job and waits for it (shared with
+    # other analysts asking for the same feed state)
     if st.button("GENERATE REPORT", use_container_width=True):
         with st.spinner("Generating SITREP..."):
             try:
-                res = requests.get(f"{API_BASE_URL}8000/v1/generate_report")
-                if res.status_code == 200:
-                    st.session_state["latest_report"] = res.json().get("report", "No report generated.")
+                report = request_report()
+                if report is not None:
+                    st.session_state["latest_report"] = report
                     st.success("Report Generated Successfully")
                 else:
                     st.error("Failed to contact Intelligence Core.")
@@ -329,9 +384,10 @@ with col_intel:
 
         with container:
             with st.chat_message("assistant"):
-                message_placeholder = st.empty()
-                message_placeholder.markdown("🔄 *Analyzing secure channels...*")
-                full_response = send_chat_query(prompt)
-                message_placeholder.markdown(full_response)
+                with st.spinner("Analyzing secure channels..."):
+                    chunks = stream_chat_query(prompt)
+                    # Wait for the first token under the spinner, then render progressively
+                    first_chunk = next(chunks, "")
+                full_response = st.write_stream(itertools.chain([first_chunk], chunks))
 
         st.session_state.messages.append({"role": "assistant", "content": full_response})
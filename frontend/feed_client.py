@@ -0,0 +1,141 @@
+"""Live feed client for the FlashPoint dashboard.
+
+Keeps one Server-Sent Events connection to the backend per Streamlit
+server process and mirrors the feed into a local buffer. Dashboard reruns
+read that buffer instead of polling the backend, so the backend request
+rate no longer depends on how many dashboards are open.
+
+When the stream drops or the backend asks for a resync, the client catches
+up through the cursor-based ``/v1/frontend/feed`` endpoint and reconnects.
+Both endpoints report the backend epoch (X-Feed-Epoch); when it changes the
+backend has restarted, so the cursor is dropped and the buffer refetched.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+
+import requests
+
+# Seconds to wait before reconnecting after a stream failure
+RECONNECT_DELAY = 2
+
+
+class LiveFeed:
+    """Thread-backed mirror of the backend event buffer."""
+
+    def __init__(self, base_url, maxlen=100):
+        self.base_url = base_url
+        self.items = deque(maxlen=maxlen)
+        self.cursor = 0  # Highest change seq received so far (new events and attached duplicates)
+        self.epoch = None  # Backend process the cursor belongs to
+        self.connected = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="flashpoint-live-feed", daemon=True)
+        self._thread.start()
+
+    def snapshot(self):
+        """Return buffered events, oldest first."""
+        with self._lock:
+            return list(self.items)
+
+    def _add(self, item):
+        """Append a new event, or replace the buffered copy of an updated one."""
+        seq = item.get("seq", 0)
+        with self._lock:
+            self.cursor = max(self.cursor, item.get("updated_seq", seq))
+            for i in range(len(self.items) - 1, -1, -1):
+                if self.items[i].get("seq") == seq:
+                    # Seen before: it gained near-duplicates since (replays may also overlap)
+                    self.items[i] = item
+                    return
+            # Older than the whole buffer: already evicted here
+            if self.items and seq < self.items[-1].get("seq", 0):
+                return
+            self.items.append(item)
+
+    def _add_duplicate(self, copy):
+        """Attach a near-duplicate copy to the buffered original it refers to."""
+        seq = copy.pop("duplicate_of_seq")
+        with self._lock:
+            self.cursor = max(self.cursor, copy.pop("seq", 0))
+            for item in reversed(self.items):
+                if item.get("seq") == seq:
+                    copies = item.setdefault("duplicates", [])
+                    # The original may already carry this copy if it was sent late
+                    if copy not in copies:
+                        copies.append(copy)
+                    return
+
+    def _epoch_changed(self, epoch):
+        """Adopt the backend epoch; on a restart, drop the buffer and cursor.
+
+        Returns True when events of an earlier epoch were discarded.
+        """
+        with self._lock:
+            if epoch is None or epoch == self.epoch:
+                return False
+            restarted = self.epoch is not None
+            self.epoch = epoch
+            if restarted:
+                self.items.clear()
+                self.cursor = 0
+            return restarted
+
+    def _fetch(self, after):
+        response = requests.get(f"{self.base_url}/v1/frontend/feed", params={"after": after}, timeout=5)
+        return response if response.status_code == 200 else None
+
+    def _catch_up(self):
+        """Fetch everything newer than our cursor through the polling endpoint."""
+        response = self._fetch(self.cursor)
+        if response is None:
+            return
+        # Backend restarted: our cursor was for the old sequence, start over
+        if self._epoch_changed(response.headers.get("X-Feed-Epoch")):
+            response = self._fetch(0)
+            if response is None:
+                return
+        for item in response.json():
+            self._add(item)
+
+    def _listen(self):
+        """Consume the SSE stream until it ends or the backend requests a resync."""
+        headers = {"Accept": "text/event-stream", "Last-Event-ID": str(self.cursor)}
+        with requests.get(f"{self.base_url}/v1/frontend/stream", headers=headers, stream=True, timeout=(5, 60)) as response:
+            response.raise_for_status()
+            # Restarted between catch-up and connect: replayed seqs are not ours
+            if self._epoch_changed(response.headers.get("X-Feed-Epoch")):
+                return
+            self.connected = True
+            event, data = None, []
+            for line in response.iter_lines(decode_unicode=True):
+                if line is None:
+                    continue
+                if line.startswith("event:"):
+                    event = line[6:].strip()
+                elif line.startswith("data:"):
+                    data.append(line[5:].strip())
+                elif line == "":
+                    # Blank line terminates one message
+                    if data:
+                        payload = json.loads("\n".join(data))
+                        if event == "resync":
+                            return
+                        if event == "duplicate":
+                            self._add_duplicate(payload)
+                        else:
+                            self._add(payload)
+                    event, data = None, []
+
+    def _run(self):
+        while True:
+            try:
+                self._catch_up()
+                self._listen()
+            except Exception:
+                # Backend down or stream interrupted: retry shortly
+                time.sleep(RECONNECT_DELAY)
+            finally:
+                self.connected = False